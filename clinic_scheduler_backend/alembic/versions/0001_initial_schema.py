@@ -0,0 +1,102 @@
+"""Initial schema: users, clinics, rooms, providers, appointments
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UUID = postgresql.UUID(as_uuid=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", UUID, primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("email", sa.String(120), nullable=False, unique=True),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("role", sa.String(20)),
+        sa.Column("phone", sa.String(20)),
+        sa.Column("date_of_birth", sa.Date()),
+        sa.Column("address", sa.String(255)),
+        sa.Column("emergency_contact", sa.String(100)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_table(
+        "clinics",
+        sa.Column("id", UUID, primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("address", sa.String(255), nullable=False),
+        sa.Column("phone", sa.String(20)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_table(
+        "rooms",
+        sa.Column("id", UUID, primary_key=True),
+        sa.Column("clinic_id", UUID, sa.ForeignKey("clinics.id"), nullable=False),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("room_type", sa.String(50)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_table(
+        "providers",
+        sa.Column("id", UUID, primary_key=True),
+        sa.Column("clinic_id", UUID, sa.ForeignKey("clinics.id"), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("specialty", sa.String(100)),
+        sa.Column("email", sa.String(120), nullable=False, unique=True),
+        sa.Column("phone", sa.String(20)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_table(
+        "appointments",
+        sa.Column("appt_id", UUID, primary_key=True),
+        sa.Column("clinic_id", UUID, sa.ForeignKey("clinics.id"), nullable=False),
+        sa.Column("room_id", UUID, sa.ForeignKey("rooms.id"), nullable=False),
+        sa.Column("patient_id", UUID, sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("provider_id", UUID, sa.ForeignKey("providers.id"), nullable=False),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("booked", "confirmed", "cancelled", "completed", "no_show", name="statusenum"),
+            nullable=False,
+            server_default="booked",
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_appointments_room_time", "appointments", ["room_id", "start_time", "end_time"])
+    op.create_index("ix_appointments_provider_time", "appointments", ["provider_id", "start_time", "end_time"])
+    op.create_index("ix_appointments_patient_time", "appointments", ["patient_id", "start_time", "end_time"])
+    op.create_index("ix_appointments_clinic_time", "appointments", ["clinic_id", "start_time"])
+    op.create_index("ix_appointments_start_appt", "appointments", ["start_time", "appt_id"])
+    op.create_index("ix_appointments_status_time", "appointments", ["status", "start_time"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("appointments")
+    op.drop_table("providers")
+    op.drop_table("rooms")
+    op.drop_table("clinics")
+    op.drop_table("users")
+    sa.Enum(name="statusenum").drop(op.get_bind(), checkfirst=True)
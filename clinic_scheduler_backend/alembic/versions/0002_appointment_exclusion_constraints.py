@@ -0,0 +1,49 @@
+"""Exclusion constraints against overlapping room and provider bookings
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# PostgreSQL only. start_time/end_time are timestamp without time zone
+# (naive UTC), so the ranges are tsrange; '[)' matches the half-open overlap
+# rule in app.services.conflicts. SQLite has no equivalent and serializes
+# bookings with BEGIN IMMEDIATE instead (app.services.booking).
+CONSTRAINTS = {
+    "ex_appointments_room_time": "room_id",
+    "ex_appointments_provider_time": "provider_id",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    for name, column in CONSTRAINTS.items():
+        op.execute(
+            f"ALTER TABLE appointments ADD CONSTRAINT {name} EXCLUDE USING gist "
+            f"({column} WITH =, tsrange(start_time, end_time, '[)') WITH &&) "
+            f"WHERE (status <> 'cancelled')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for name in CONSTRAINTS:
+        op.execute(f"ALTER TABLE appointments DROP CONSTRAINT IF EXISTS {name}")
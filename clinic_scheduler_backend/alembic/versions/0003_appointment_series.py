@@ -0,0 +1,56 @@
+"""Recurring appointment series
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UUID = postgresql.UUID(as_uuid=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "appointment_series",
+        sa.Column("series_id", UUID, primary_key=True),
+        sa.Column("clinic_id", UUID, sa.ForeignKey("clinics.id"), nullable=False),
+        sa.Column("room_id", UUID, sa.ForeignKey("rooms.id"), nullable=False),
+        sa.Column("patient_id", UUID, sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("provider_id", UUID, sa.ForeignKey("providers.id"), nullable=False),
+        sa.Column("frequency", sa.String(10), nullable=False),
+        sa.Column("interval", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer()),
+        sa.Column("until", sa.DateTime()),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    with op.batch_alter_table("appointments") as batch_op:
+        batch_op.add_column(sa.Column("series_id", UUID, nullable=True))
+        batch_op.create_foreign_key(
+            "fk_appointments_series_id", "appointment_series", ["series_id"], ["series_id"]
+        )
+        batch_op.create_index("ix_appointments_series_time", ["series_id", "start_time"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("appointments") as batch_op:
+        batch_op.drop_index("ix_appointments_series_time")
+        batch_op.drop_constraint("fk_appointments_series_id", type_="foreignkey")
+        batch_op.drop_column("series_id")
+    op.drop_table("appointment_series")
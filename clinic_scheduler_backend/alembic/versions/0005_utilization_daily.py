@@ -0,0 +1,42 @@
+"""Daily utilization rollup
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UUID = postgresql.UUID(as_uuid=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "utilization_daily",
+        sa.Column("clinic_id", UUID, primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("room_id", UUID, primary_key=True),
+        sa.Column("provider_id", UUID, primary_key=True),
+        sa.Column("status", sa.String(20), primary_key=True),
+        sa.Column("appointments", sa.Integer(), nullable=False),
+        sa.Column("booked_minutes", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_utilization_daily_day", "utilization_daily", ["day"])
+    # Existing appointments are rolled up by `python rebuild_rollups.py`
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("utilization_daily")
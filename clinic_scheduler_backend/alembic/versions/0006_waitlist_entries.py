@@ -0,0 +1,52 @@
+"""Waitlist entries
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UUID = postgresql.UUID(as_uuid=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "waitlist_entries",
+        sa.Column("entry_id", UUID, primary_key=True),
+        sa.Column("clinic_id", UUID, sa.ForeignKey("clinics.id"), nullable=False),
+        sa.Column("provider_id", UUID, sa.ForeignKey("providers.id")),
+        sa.Column("patient_id", UUID, sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("earliest", sa.DateTime(), nullable=False),
+        sa.Column("latest", sa.DateTime(), nullable=False),
+        sa.Column("duration_minutes", sa.Integer(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("offered_room_id", UUID, sa.ForeignKey("rooms.id")),
+        sa.Column("offered_provider_id", UUID, sa.ForeignKey("providers.id")),
+        sa.Column("offered_start", sa.DateTime()),
+        sa.Column("offered_end", sa.DateTime()),
+        sa.Column("offer_expires_at", sa.DateTime()),
+        sa.Column("appt_id", UUID),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_waitlist_entries_clinic_status", "waitlist_entries", ["clinic_id", "status"])
+    op.create_index("ix_waitlist_entries_patient", "waitlist_entries", ["patient_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("waitlist_entries")
@@ -0,0 +1,58 @@
+"""Appointments archive (monthly partitions on PostgreSQL)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UUID = postgresql.UUID(as_uuid=True)
+
+# The enum type already exists (revision 0001)
+STATUS = postgresql.ENUM(
+    "booked", "confirmed", "cancelled", "completed", "no_show", name="statusenum", create_type=False
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Range-partitioned by month on PostgreSQL; the archive job creates each
+    # month's partition (appointments_archive_yYYYYmMM) before moving rows
+    op.create_table(
+        "appointments_archive",
+        sa.Column("appt_id", UUID, primary_key=True),
+        sa.Column("start_time", sa.DateTime(), primary_key=True),
+        sa.Column("clinic_id", UUID, sa.ForeignKey("clinics.id"), nullable=False),
+        sa.Column("room_id", UUID, sa.ForeignKey("rooms.id"), nullable=False),
+        sa.Column("patient_id", UUID, sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("provider_id", UUID, sa.ForeignKey("providers.id"), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=False),
+        sa.Column("status", STATUS, nullable=False),
+        sa.Column("series_id", UUID, sa.ForeignKey("appointment_series.series_id")),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        sa.Column("archived_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        postgresql_partition_by="RANGE (start_time)",
+    )
+    op.create_index("ix_appointments_archive_start_appt", "appointments_archive", ["start_time", "appt_id"])
+    op.create_index("ix_appointments_archive_patient_time", "appointments_archive", ["patient_id", "start_time"])
+    op.create_index("ix_appointments_archive_provider_time", "appointments_archive", ["provider_id", "start_time"])
+    op.create_index("ix_appointments_archive_clinic_time", "appointments_archive", ["clinic_id", "start_time"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Dropping the parent drops every partition with it
+    op.drop_table("appointments_archive")
@@ -0,0 +1,52 @@
+"""Make the appointment exclusion constraints deferrable
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# PostgreSQL only, like revision 0002. INITIALLY IMMEDIATE keeps checking
+# every statement as before; a series move runs SET CONSTRAINTS ... DEFERRED
+# so its single UPDATE is checked at commit, not row by row against the
+# old slots of occurrences it is also moving.
+CONSTRAINTS = {
+    "ex_appointments_room_time": "room_id",
+    "ex_appointments_provider_time": "provider_id",
+}
+
+
+def recreate(deferrable: str) -> None:
+    for name, column in CONSTRAINTS.items():
+        op.execute(f"ALTER TABLE appointments DROP CONSTRAINT IF EXISTS {name}")
+        op.execute(
+            f"ALTER TABLE appointments ADD CONSTRAINT {name} EXCLUDE USING gist "
+            f"({column} WITH =, tsrange(start_time, end_time, '[)') WITH &&) "
+            f"WHERE (status <> 'cancelled'){deferrable}"
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    recreate(" DEFERRABLE INITIALLY IMMEDIATE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    recreate("")
@@ -1,20 +1,131 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 from dotenv import load_dotenv
 
+from .utils.metrics import instrument_engine
+
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./clinic.db")
 
-connect_args = {"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+# Optional read-only replica; GET endpoints read from it when set
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+
+
+def to_async_url(url: str) -> str:
+    """Swap a sync driver URL for its asyncio driver (aiosqlite / asyncpg)."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    for prefix in ("postgresql+psycopg2:", "postgresql:", "postgres:"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg:" + url[len(prefix):]
+    return url
 
-engine = create_engine(
-    DATABASE_URL, connect_args=connect_args
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+ASYNC_DATABASE_READ_URL = os.getenv(
+    "ASYNC_DATABASE_READ_URL", to_async_url(DATABASE_READ_URL) if DATABASE_READ_URL else None
 )
+
+
+# ==========================================================
+# ENGINE PROFILES
+# ==========================================================
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+
+def engine_options(url: str) -> dict:
+    """
+    Pool settings for server databases, read from the environment.
+    SQLite keeps SQLAlchemy's default pool for its driver.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", 10),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 20),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+
+
+SQLITE_PRAGMAS = {
+    # WAL lets readers run alongside the single writer
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000),
+    "mmap_size": _env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024),
+}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
+
+
+# Execution option for write transactions that must hold SQLite's write
+# lock from their first statement (check-then-insert booking). Ignored on
+# server databases, which rely on row locks and constraints instead.
+WRITE_LOCK = {"sqlite_begin": "IMMEDIATE"}
+
+
+def _disable_pysqlite_begin(dbapi_connection, connection_record):
+    # Stop the driver from issuing its own deferred BEGIN; _emit_sqlite_begin
+    # starts every transaction instead
+    dbapi_connection.isolation_level = None
+
+
+def _emit_sqlite_begin(conn):
+    mode = conn.get_execution_options().get("sqlite_begin")
+    conn.exec_driver_sql(f"BEGIN {mode}" if mode else "BEGIN")
+
+
+def make_engine(url: str):
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    new_engine = create_engine(url, connect_args=connect_args, **engine_options(url))
+    if url.startswith("sqlite"):
+        event.listen(new_engine, "connect", _set_sqlite_pragmas)
+    instrument_engine(new_engine)
+    return new_engine
+
+
+def make_async_engine(url: str):
+    new_engine = create_async_engine(url, **engine_options(url))
+    if url.startswith("sqlite"):
+        event.listen(new_engine.sync_engine, "connect", _set_sqlite_pragmas)
+        event.listen(new_engine.sync_engine, "connect", _disable_pysqlite_begin)
+        event.listen(new_engine.sync_engine, "begin", _emit_sqlite_begin)
+    instrument_engine(new_engine.sync_engine)
+    return new_engine
+
+
+# Sync engine: scripts (seed_clinics.py) and Alembic migrations
+engine = make_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-# Dependency for FastAPI routes
+# Async engine: used by the API routers so a worker is never parked on I/O
+async_engine = make_async_engine(ASYNC_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Read sessions go to the replica when one is configured, else the primary
+async_read_engine = make_async_engine(ASYNC_DATABASE_READ_URL) if ASYNC_DATABASE_READ_URL else async_engine
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Dependency for scripts and any sync code paths
 def get_db():
     db = SessionLocal()
     try:
@@ -22,8 +133,16 @@ def get_db():
     finally:
         db.close()
 
-# Import models so tables are registered
-from .models import User, Appointment, Clinic, Room, Provider  # make sure this path is correct
+# Dependency for FastAPI routes
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Dependency for read-only FastAPI routes (GET)
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+# Import models so tables are registered. The schema itself is managed by
+# Alembic (alembic upgrade head), not created at import time.
+from .models import User, Appointment, AppointmentSeries, Clinic, Room, Provider, ReminderOutbox, UtilizationDaily, WaitlistEntry, AppointmentArchive  # make sure this path is correct
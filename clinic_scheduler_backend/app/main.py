@@ -1,10 +1,49 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .database import async_engine
+from .utils.metrics import MetricsMiddleware
+from .utils.ratelimit import RATE_LIMIT_ENABLED, RateLimitMiddleware
+from .schema_check import check_schema_version
+
+
+# Run the reminder dispatcher inside this API process. Off by default; a
+# separate `python reminder_worker.py` keeps it off the request path.
+REMINDER_WORKER = os.getenv("REMINDER_WORKER", "false").lower() in ("1", "true", "yes", "on")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await check_schema_version(async_engine)
+
+    if not REMINDER_WORKER:
+        yield
+        return
+
+    from .services.reminders import ReminderDispatcher, load_sender
+
+    stop = asyncio.Event()
+    dispatcher = ReminderDispatcher(load_sender(os.getenv("REMINDER_SENDER", "log")))
+    task = asyncio.create_task(dispatcher.run(stop))
+    try:
+        yield
+    finally:
+        stop.set()
+        await task
+
+
 # ==========================================================
 # FASTAPI APP SETUP
 # ==========================================================
-app = FastAPI(title="Clinic Scheduler API")
+app = FastAPI(title="Clinic Scheduler API", lifespan=lifespan)
+
+# Innermost, so refused requests still carry CORS headers and are counted
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,23 +51,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Retry-After"],
 )
 
+# Outermost, so latency includes CORS and error handling
+app.add_middleware(MetricsMiddleware)
+
 # ==========================================================
 # INCLUDE ROUTERS
 # ==========================================================
-from .routers import appointments, auth  # Make sure this path matches your project structure
+from .routers import appointments, auth, availability, clinics, events, metrics, providers, reports, rooms, series, waitlist  # Make sure this path matches your project structure
 app.include_router(appointments.router)
 app.include_router(auth.router)
-
-from .routers import clinics
 app.include_router(clinics.router)
-
-from .routers import rooms
 app.include_router(rooms.router)
-
-from .routers import providers
 app.include_router(providers.router)
+app.include_router(availability.router)
+app.include_router(series.router)
+app.include_router(reports.router)
+app.include_router(waitlist.router)
+app.include_router(events.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 def read_root():
@@ -1,7 +1,12 @@
 from .user import User
-from .appointment import Appointment
+from .appointment import Appointment, StatusEnum
 from .clinic import Clinic
 from .room import Room
 from .provider import Provider
+from .series import AppointmentSeries
+from .reminder import ReminderOutbox
+from .utilization import UtilizationDaily
+from .waitlist import WaitlistEntry
+from .archive import AppointmentArchive
 
-__all__ = ["User", "Appointment", "Clinic", "Room", "Provider", "StatusEnum"]
+__all__ = ["User", "Appointment", "Clinic", "Room", "Provider", "AppointmentSeries", "ReminderOutbox", "UtilizationDaily", "WaitlistEntry", "AppointmentArchive", "StatusEnum"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -15,6 +15,23 @@ class StatusEnum(str, enum.Enum):
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # Conflict detection: one short range scan per resource
+        Index("ix_appointments_room_time", "room_id", "start_time", "end_time"),
+        Index("ix_appointments_provider_time", "provider_id", "start_time", "end_time"),
+        Index("ix_appointments_patient_time", "patient_id", "start_time", "end_time"),
+        # Per-clinic range loads (availability search)
+        Index("ix_appointments_clinic_time", "clinic_id", "start_time"),
+        # Keyset pagination order and status filtering for listings
+        Index("ix_appointments_start_appt", "start_time", "appt_id"),
+        Index("ix_appointments_status_time", "status", "start_time"),
+        # Set-based cancel/move of a recurring series
+        Index("ix_appointments_series_time", "series_id", "start_time"),
+        # On PostgreSQL, alembic revision 0002 also adds exclusion constraints
+        # (ex_appointments_room_time, ex_appointments_provider_time) so two
+        # active bookings can never overlap on a room or provider; revision
+        # 0008 makes them DEFERRABLE INITIALLY IMMEDIATE for series moves
+    )
 
     appt_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     clinic_id = Column(UUID(as_uuid=True), ForeignKey("clinics.id"), nullable=False)
@@ -24,6 +41,7 @@ class Appointment(Base):
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=False)
     status = Column(Enum(StatusEnum), nullable=False, server_default="booked")
+    series_id = Column(UUID(as_uuid=True), ForeignKey("appointment_series.series_id"), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -33,4 +51,5 @@ class Appointment(Base):
     clinic = relationship("Clinic", back_populates="appointments")
     room = relationship("Room", back_populates="appointments")
     provider = relationship("Provider", back_populates="appointments")
+    series = relationship("AppointmentSeries", back_populates="appointments")
 
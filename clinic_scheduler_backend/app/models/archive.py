@@ -0,0 +1,46 @@
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from ..database import Base
+from .appointment import StatusEnum
+
+class AppointmentArchive(Base):
+    """
+    Closed appointments (completed, cancelled, no-show) moved out of the hot
+    appointments table by the archive job once they are older than
+    ARCHIVE_AFTER_DAYS. Same columns plus archived_at. On PostgreSQL the
+    table is range-partitioned by month on start_time (partitions are
+    created by the archive job), so old months can be detached or dropped
+    whole. start_time is part of the key because a partitioned table's
+    primary key must include the partition column.
+    """
+    __tablename__ = "appointments_archive"
+    __table_args__ = (
+        # Listing order, and the per-scope lists that read the archive
+        Index("ix_appointments_archive_start_appt", "start_time", "appt_id"),
+        Index("ix_appointments_archive_patient_time", "patient_id", "start_time"),
+        Index("ix_appointments_archive_provider_time", "provider_id", "start_time"),
+        Index("ix_appointments_archive_clinic_time", "clinic_id", "start_time"),
+        {"postgresql_partition_by": "RANGE (start_time)"},
+    )
+
+    appt_id = Column(UUID(as_uuid=True), primary_key=True)
+    start_time = Column(DateTime, primary_key=True)
+    clinic_id = Column(UUID(as_uuid=True), ForeignKey("clinics.id"), nullable=False)
+    room_id = Column(UUID(as_uuid=True), ForeignKey("rooms.id"), nullable=False)
+    patient_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    provider_id = Column(UUID(as_uuid=True), ForeignKey("providers.id"), nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    status = Column(Enum(StatusEnum), nullable=False)
+    series_id = Column(UUID(as_uuid=True), ForeignKey("appointment_series.series_id"), nullable=True)
+
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    # Relationships (read-only; for ?expand= on archived rows)
+    patient = relationship("User", viewonly=True)
+    clinic = relationship("Clinic", viewonly=True)
+    room = relationship("Room", viewonly=True)
+    provider = relationship("Provider", viewonly=True)
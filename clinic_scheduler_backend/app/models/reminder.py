@@ -0,0 +1,35 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from ..database import Base
+
+class ReminderOutbox(Base):
+    """
+    One reminder job per appointment and lead time (e.g. "24h"). Written by
+    the reminder scheduler, claimed and sent in batches by the dispatcher.
+    next_attempt_at doubles as the claim lease: a job in "sending" whose
+    lease has run out (crashed worker) becomes claimable again.
+    """
+    __tablename__ = "reminder_outbox"
+    __table_args__ = (
+        UniqueConstraint("appt_id", "kind", name="uq_reminder_outbox_appt_kind"),
+        # Dispatcher claim scan: due jobs in send order
+        Index("ix_reminder_outbox_status_next", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    appt_id = Column(UUID(as_uuid=True), ForeignKey("appointments.appt_id"), nullable=False)
+    kind = Column(String(20), nullable=False)
+    channel = Column(String(20), nullable=False, default="sms")
+    send_at = Column(DateTime, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, sending, sent, failed, skipped
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False)
+    last_error = Column(String(500), nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    appointment = relationship("Appointment")
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+import uuid
+from ..database import Base
+
+class AppointmentSeries(Base):
+    """
+    A recurrence rule (daily, weekly or monthly, every `interval` periods,
+    ending after `count` occurrences or at `until`). start_time/end_time
+    are the first occurrence; each occurrence is its own appointments row
+    pointing back here through series_id.
+    """
+    __tablename__ = "appointment_series"
+
+    series_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    clinic_id = Column(UUID(as_uuid=True), ForeignKey("clinics.id"), nullable=False)
+    room_id = Column(UUID(as_uuid=True), ForeignKey("rooms.id"), nullable=False)
+    patient_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    provider_id = Column(UUID(as_uuid=True), ForeignKey("providers.id"), nullable=False)
+    frequency = Column(String(10), nullable=False)  # daily, weekly, monthly
+    interval = Column(Integer, nullable=False, default=1)
+    count = Column(Integer, nullable=True)
+    until = Column(DateTime, nullable=True)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    appointments = relationship("Appointment", back_populates="series")
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Date, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from ..database import Base
+
+class UtilizationDaily(Base):
+    """
+    Appointment count and booked minutes per day, clinic, room, provider
+    and status. Kept current by the booking handlers (app.services.rollups);
+    reports aggregate these rows instead of the appointments table.
+    """
+    __tablename__ = "utilization_daily"
+    __table_args__ = (
+        # Reports across clinics for a date range
+        Index("ix_utilization_daily_day", "day"),
+    )
+
+    # Primary key leads with clinic_id, day: a clinic's date range is one range scan
+    clinic_id = Column(UUID(as_uuid=True), primary_key=True)
+    day = Column(Date, primary_key=True)
+    room_id = Column(UUID(as_uuid=True), primary_key=True)
+    provider_id = Column(UUID(as_uuid=True), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    appointments = Column(Integer, nullable=False, default=0)
+    booked_minutes = Column(Integer, nullable=False, default=0)
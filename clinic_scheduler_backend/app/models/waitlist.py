@@ -0,0 +1,44 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+import uuid
+from ..database import Base
+
+class WaitlistEntry(Base):
+    """
+    A patient waiting for a slot at a clinic (optionally with one provider)
+    somewhere in [earliest, latest]. When a matching booking is cancelled
+    the freed slot is offered to the entry (status "offered", offered_*
+    columns set) until offer_expires_at; accepting it books the appointment.
+    """
+    __tablename__ = "waitlist_entries"
+    __table_args__ = (
+        # Loading a clinic's waiting entries into the in-memory index
+        Index("ix_waitlist_entries_clinic_status", "clinic_id", "status"),
+        Index("ix_waitlist_entries_patient", "patient_id"),
+    )
+
+    entry_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    clinic_id = Column(UUID(as_uuid=True), ForeignKey("clinics.id"), nullable=False)
+    provider_id = Column(UUID(as_uuid=True), ForeignKey("providers.id"), nullable=True)  # None: any provider
+    patient_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    earliest = Column(DateTime, nullable=False)
+    latest = Column(DateTime, nullable=False)
+    duration_minutes = Column(Integer, nullable=False)
+    priority = Column(Integer, nullable=False, default=0)  # higher is served first
+    status = Column(String(20), nullable=False, default="waiting")  # waiting, offered, booked, withdrawn
+
+    offered_room_id = Column(UUID(as_uuid=True), ForeignKey("rooms.id"), nullable=True)
+    offered_provider_id = Column(UUID(as_uuid=True), ForeignKey("providers.id"), nullable=True)
+    offered_start = Column(DateTime, nullable=True)
+    offered_end = Column(DateTime, nullable=True)
+    offer_expires_at = Column(DateTime, nullable=True)
+    appt_id = Column(UUID(as_uuid=True), nullable=True)  # the booking made from an accepted offer
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    clinic = relationship("Clinic")
+    patient = relationship("User")
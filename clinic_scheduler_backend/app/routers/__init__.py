@@ -1,3 +1,3 @@
-from . import appointments, auth, clinics, rooms, providers
+from . import appointments, auth, clinics, rooms, providers, availability, events, metrics, reports, series, waitlist
 
-__all__ = ["appointments", "auth", "clinics", "rooms", "providers"]
+__all__ = ["appointments", "auth", "clinics", "rooms", "providers", "availability", "events", "metrics", "reports", "series", "waitlist"]
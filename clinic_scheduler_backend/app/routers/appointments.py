@@ -1,29 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select, tuple_, union_all
+from sqlalchemy.orm import joinedload
+from datetime import datetime
+import csv
+import heapq
+import io
+import itertools
+import json
 from uuid import UUID  # ✅ FIX
-from ..database import get_db
+from ..database import AsyncReadSessionLocal, get_async_db, get_async_read_db
 from .. import models, schemas
-from ..utils.jwt_token import verify_token
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from ..utils.jwt_token import get_token_payload as get_current_user
+from ..services.archive import appointment_sources
+from ..services.booking import BookingConflict, book_appointment, with_write_lock
+from ..services.conflicts import (
+    INACTIVE_STATUSES, MAX_APPOINTMENT_DURATION, find_conflicts, insert_appointments, resolve_batch
+)
+from ..services.rollups import apply_rollup
+from ..services.waitlist import ACTIVE_STATUSES, offer_released_slot
+from ..utils.datetimes import to_naive_utc
+from ..utils.events import publish_appointment
+from ..utils.fastjson import json_response
+from ..utils.pagination import decode_cursor, encode_cursor
 
-security = HTTPBearer()
+router = APIRouter(prefix="/appointments", tags=["Appointments"])
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
-    payload = verify_token(token)
-    if not payload:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return payload
+# Largest batch accepted by POST /appointments/bulk
+MAX_BULK_ITEMS = 1000
 
-router = APIRouter(prefix="/appointments", tags=["Appointments"])
+# Page sizes for GET /appointments/
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+FAST_MAX_PAGE_SIZE = 10000
 
 
 # ---------------- CREATE ----------------
 @router.post("/", response_model=schemas.Appointment)
-def create_appointment(
+async def create_appointment(
     appt: schemas.AppointmentCreate, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: dict = Depends(get_current_user)
 ):
 
@@ -31,58 +48,105 @@ def create_appointment(
     if appt.end_time <= appt.start_time:
         raise HTTPException(status_code=400, detail="End time must be after start time")
 
-    # Convert IDs to UUID (🔥 FIX)
-    try:
-        appt_dict = appt.dict()
-        appt_dict["clinic_id"] = UUID(appt_dict["clinic_id"])
-        appt_dict["room_id"] = UUID(appt_dict["room_id"])
-        appt_dict["patient_id"] = UUID(appt_dict["patient_id"])
-        appt_dict["provider_id"] = UUID(appt_dict["provider_id"]) if appt_dict.get("provider_id") else None
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid UUID format")
-
-    # Check for overlapping appointments
-    conflict = db.query(models.Appointment).filter(
-        and_(
-            models.Appointment.clinic_id == appt_dict["clinic_id"],
-            models.Appointment.room_id == appt_dict["room_id"],
-            models.Appointment.status != models.StatusEnum.cancelled,
-            or_(
-                # New appointment starts during existing appointment
-                and_(models.Appointment.start_time <= appt.start_time,
-                     models.Appointment.end_time > appt.start_time),
-                # New appointment ends during existing appointment
-                and_(models.Appointment.start_time < appt.end_time,
-                     models.Appointment.end_time >= appt.end_time),
-                # New appointment fully contains existing
-                and_(models.Appointment.start_time >= appt.start_time,
-                     models.Appointment.end_time <= appt.end_time)
-            )
-        )
-    ).first()
-
-    if conflict:
-        raise HTTPException(status_code=409, detail="Time slot conflicts with existing appointment")
+    if appt.end_time - appt.start_time > MAX_APPOINTMENT_DURATION:
+        raise HTTPException(status_code=400, detail="Appointment is longer than the maximum allowed duration")
 
     try:
-        new_appt = models.Appointment(**appt_dict)
-        db.add(new_appt)
-        db.commit()
-        db.refresh(new_appt)
+        new_appt = await book_appointment(db, appt.dict())
+        await db.refresh(new_appt)
+        publish_appointment("appointment.created", appointment_payload(new_appt))
         return new_appt
 
+    except BookingConflict as e:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Time slot conflicts with existing appointment ({e})"
+        )
+
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
-# ---------------- GET ----------------
-@router.get("/", response_model=list[schemas.Appointment])
-def get_appointments(
-    db: Session = Depends(get_db), 
+# ---------------- BULK CREATE ----------------
+@router.post("/bulk", response_model=list[schemas.BulkBookingResult])
+async def create_appointments_bulk(
+    appts: list[schemas.AppointmentCreate],
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
 
+    if current_user.get("role") not in ["staff", "admin"]:
+        raise HTTPException(status_code=403, detail="Not authorized to book appointments in bulk")
+
+    if len(appts) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"A batch cannot exceed {MAX_BULK_ITEMS} appointments")
+
+    async def resolve_and_insert():
+        # One conflict load for the whole batch, overlaps resolved in memory
+        decisions, rows = await db.run_sync(resolve_batch, appts)
+        await db.run_sync(insert_appointments, rows)
+        await db.run_sync(apply_rollup, (), rows)
+        return decisions, rows
+
+    try:
+        decisions, rows = await with_write_lock(db, resolve_and_insert)
+    except BookingConflict as e:
+        raise HTTPException(
+            status_code=409,
+            detail=f"A concurrent booking took a slot in this batch ({e}); retry the batch"
+        )
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    for row in rows:
+        publish_appointment("appointment.created", row)
+    return [decision._asdict() for decision in decisions]
+
+
+# ---------------- GET ----------------
+class AppointmentFilters:
+    """Optional list filters, all applied in SQL."""
+
+    def __init__(
+        self,
+        clinic_id: UUID | None = None,
+        room_id: UUID | None = None,
+        provider_id: UUID | None = None,
+        status: models.StatusEnum | None = None,
+        series_id: UUID | None = None,
+        date_from: datetime | None = Query(None, description="Appointments starting at or after this time"),
+        date_to: datetime | None = Query(None, description="Appointments starting before this time"),
+    ):
+        self.clinic_id = clinic_id
+        self.room_id = room_id
+        self.provider_id = provider_id
+        self.status = status
+        self.series_id = series_id
+        self.date_from = to_naive_utc(date_from) if date_from else None
+        self.date_to = to_naive_utc(date_to) if date_to else None
+
+    def apply(self, query, Appointment=models.Appointment):
+        if self.clinic_id is not None:
+            query = query.filter(Appointment.clinic_id == self.clinic_id)
+        if self.room_id is not None:
+            query = query.filter(Appointment.room_id == self.room_id)
+        if self.provider_id is not None:
+            query = query.filter(Appointment.provider_id == self.provider_id)
+        if self.status is not None:
+            query = query.filter(Appointment.status == self.status)
+        if self.series_id is not None:
+            query = query.filter(Appointment.series_id == self.series_id)
+        if self.date_from is not None:
+            query = query.filter(Appointment.start_time >= self.date_from)
+        if self.date_to is not None:
+            query = query.filter(Appointment.start_time < self.date_to)
+        return query
+
+
+def scope_to_user(query, current_user: dict, Appointment=models.Appointment):
+    """Admins see everything, staff their provider schedule, patients their own bookings."""
     raw_user_id = current_user.get("user_id")
     role = current_user.get("role")
 
@@ -93,27 +157,237 @@ def get_appointments(
         raise HTTPException(status_code=400, detail="Invalid user UUID")
 
     if role == "admin":
-        appointments = db.query(models.Appointment).all()
-
+        return query
     elif role == "staff":
-        appointments = db.query(models.Appointment).filter(
-            models.Appointment.provider_id == user_id
-        ).all()
-
+        return query.filter(Appointment.provider_id == user_id)
     else:  # patient
-        appointments = db.query(models.Appointment).filter(
-            models.Appointment.patient_id == user_id
-        ).all()
+        return query.filter(Appointment.patient_id == user_id)
+
+
+# Columns selected by the fast path, matching schemas.Appointment
+LIST_COLUMNS = tuple(schemas.Appointment.model_fields)
+
+def appointment_payload(appointment) -> dict:
+    """Loaded column values of an appointment, as pushed to event subscribers."""
+    return {name: getattr(appointment, name) for name in LIST_COLUMNS}
+
+
+# Relationships that ?expand= may inline. All are many-to-one, so a
+# joinedload adds columns to the page query instead of extra round trips.
+EXPANDABLE = ("patient", "clinic", "room", "provider")
+
+
+def parse_expand(
+    expand: str | None = Query(None, description="Comma-separated related records to inline: patient, clinic, room, provider")
+) -> tuple[str, ...]:
+    if not expand:
+        return ()
+    names = tuple(dict.fromkeys(name.strip() for name in expand.split(",") if name.strip()))
+    unknown = [name for name in names if name not in EXPANDABLE]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Cannot expand: {', '.join(unknown)}")
+    return names
+
+
+def with_expand(query, expand: tuple[str, ...], Appointment=models.Appointment):
+    return query.options(*(joinedload(getattr(Appointment, name)) for name in expand))
+
+
+def to_expanded(appointment, expand: tuple[str, ...]) -> schemas.AppointmentExpanded:
+    """
+    Build the response object from loaded columns only. Relationships that
+    were not eager-loaded are never touched, so nothing lazy-loads.
+    """
+    fields = appointment_payload(appointment)
+    fields.update((name, getattr(appointment, name)) for name in expand)
+    return schemas.AppointmentExpanded.model_validate(fields, from_attributes=True)
+
+
+@router.get(
+    "/",
+    response_model=list[schemas.AppointmentExpanded],
+    response_model_exclude_unset=True,
+)
+async def get_appointments(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=FAST_MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    fast: bool = Query(False, description="Serialize plain column tuples directly (allows larger pages)"),
+    expand: tuple[str, ...] = Depends(parse_expand),
+    filters: AppointmentFilters = Depends(),
+    db: AsyncSession = Depends(get_async_read_db), 
+    current_user: dict = Depends(get_current_user)
+):
 
-    return appointments
+    if not fast and limit > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit cannot exceed {MAX_PAGE_SIZE} unless fast=true")
+    if fast and expand:
+        raise HTTPException(status_code=400, detail="expand is not supported with fast=true")
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # The archive is read too only when the page can reach back into it
+    bounds = [bound for bound in (filters.date_from, after[0] if after else None) if bound]
+    sources = await db.run_sync(appointment_sources, max(bounds) if bounds else None)
+
+    pages = []
+    for Appointment in sources:
+        if fast:
+            # Plain tuples: no ORM identity map, no response_model validation
+            query = select(*(getattr(Appointment, column) for column in LIST_COLUMNS))
+        else:
+            query = with_expand(select(Appointment), expand, Appointment)
+        query = filters.apply(scope_to_user(query, current_user, Appointment), Appointment)
+
+        # Keyset pagination on (start_time, appt_id): each page is an index
+        # range scan that starts where the previous one stopped.
+        if after:
+            query = query.filter(tuple_(Appointment.start_time, Appointment.appt_id) > tuple_(*after))
+
+        result = await db.execute(
+            query.order_by(Appointment.start_time, Appointment.appt_id).limit(limit + 1)
+        )
+        pages.append(result.all() if fast else result.scalars().all())
+
+    # Both pages are sorted on the same key, so merging them is enough
+    appointments = list(itertools.islice(
+        heapq.merge(*pages, key=lambda row: (row.start_time, row.appt_id)), limit + 1
+    ))
+
+    next_cursor = None
+    if len(appointments) > limit:
+        appointments = appointments[:limit]
+        last = appointments[-1]
+        next_cursor = encode_cursor(last.start_time, last.appt_id)
+
+    if fast:
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return json_response(request, [dict(zip(LIST_COLUMNS, row)) for row in appointments], headers)
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [to_expanded(appointment, expand) for appointment in appointments]
+
+
+# ---------------- EXPORT ----------------
+EXPORT_COLUMNS = (
+    "appt_id", "clinic_id", "room_id", "patient_id", "provider_id",
+    "start_time", "end_time", "status", "created_at",
+)
+
+# Rows fetched from the cursor and written per response chunk
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _export_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, models.StatusEnum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def _stream_export(filters: AppointmentFilters, export_format: str):
+    """
+    Stream plain column tuples from a server-side cursor in fixed-size
+    chunks. The generator owns its session so the cursor stays open for
+    the whole response, and no ORM objects are built along the way.
+    """
+    async with AsyncReadSessionLocal() as db:
+        # Archived rows are included when the range reaches back into them
+        sources = await db.run_sync(appointment_sources, filters.date_from)
+        stmt = union_all(*(
+            filters.apply(select(*(getattr(Appointment, column) for column in EXPORT_COLUMNS)), Appointment)
+            for Appointment in sources
+        )).order_by("start_time", "appt_id")
+
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            async for chunk in result.partitions():
+                writer.writerows([_export_value(v) for v in row] for row in chunk)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            async for chunk in result.partitions():
+                yield "".join(
+                    json.dumps({
+                        column: None if value is None else _export_value(value)
+                        for column, value in zip(EXPORT_COLUMNS, row)
+                    }) + "\n"
+                    for row in chunk
+                )
+
+
+@router.get("/export")
+async def export_appointments(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    filters: AppointmentFilters = Depends(),
+    current_user: dict = Depends(get_current_user)
+):
+
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to export appointments")
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_export(filters, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=appointments.{export_format}"},
+    )
+
+
+# ---------------- GET ONE ----------------
+@router.get(
+    "/{appt_id}",
+    response_model=schemas.AppointmentExpanded,
+    response_model_exclude_unset=True,
+)
+async def get_appointment(
+    appt_id: UUID,
+    expand: tuple[str, ...] = Depends(parse_expand),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+
+    # Hot table first; closed appointments moved out by the archive job
+    # are still readable by id
+    appointment = None
+    for Appointment in (models.Appointment, models.AppointmentArchive):
+        query = scope_to_user(
+            with_expand(select(Appointment), expand, Appointment).filter(Appointment.appt_id == appt_id),
+            current_user,
+            Appointment,
+        )
+        appointment = (await db.execute(query)).scalars().first()
+        if appointment:
+            break
+
+    if not appointment:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+
+    return to_expanded(appointment, expand)
 
 
 # ---------------- UPDATE STATUS ----------------
 @router.put("/{appt_id}/status", response_model=schemas.Appointment)
-def update_appointment_status(
+async def update_appointment_status(
     appt_id: str, 
     status: str, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: dict = Depends(get_current_user)
 ):
 
@@ -126,27 +400,50 @@ def update_appointment_status(
     except:
         raise HTTPException(status_code=400, detail="Invalid appointment UUID")
 
-    appointment = db.query(models.Appointment).filter(
-        models.Appointment.appt_id == appt_uuid
-    ).first()
-
-    if not appointment:
-        raise HTTPException(status_code=404, detail="Appointment not found")
-
     if status not in [e.value for e in models.StatusEnum]:
         raise HTTPException(status_code=400, detail="Invalid status")
 
-    appointment.status = status
-    db.commit()
-    db.refresh(appointment)
+    async def change():
+        appointment = await db.get(models.Appointment, appt_uuid)
+        if not appointment:
+            raise HTTPException(status_code=404, detail="Appointment not found")
+
+        previous = appointment_payload(appointment)
+        # Leaving cancelled takes the slot back, so it is checked like a new booking
+        if previous["status"] in INACTIVE_STATUSES and status not in INACTIVE_STATUSES:
+            conflicts = await db.run_sync(
+                find_conflicts,
+                room_id=appointment.room_id,
+                provider_id=appointment.provider_id,
+                patient_id=appointment.patient_id,
+                start_time=appointment.start_time,
+                end_time=appointment.end_time,
+                exclude_appt_id=appointment.appt_id,
+            )
+            if conflicts:
+                raise BookingConflict(sorted({c.resource for c in conflicts}))
+
+        appointment.status = status
+        await db.run_sync(apply_rollup, [previous], [{**previous, "status": status}])
+        return appointment, previous
+
+    try:
+        appointment, previous = await with_write_lock(db, change)
+    except BookingConflict as e:
+        raise HTTPException(status_code=409, detail=f"Time slot conflicts with existing appointment ({e})")
+
+    await db.refresh(appointment)
+    publish_appointment("appointment.status", appointment_payload(appointment))
+    if status == models.StatusEnum.cancelled.value and previous["status"] in ACTIVE_STATUSES:
+        await offer_released_slot(db, previous)
     return appointment
 
 
 # ---------------- DELETE ----------------
 @router.delete("/{appt_id}")
-def delete_appointment(
+async def delete_appointment(
     appt_id: str, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: dict = Depends(get_current_user)
 ):
 
@@ -166,23 +463,31 @@ def delete_appointment(
         raise HTTPException(status_code=400, detail="Invalid user UUID")
 
     if role not in ["staff", "admin"]:
-        appointment = db.query(models.Appointment).filter(
-            models.Appointment.appt_id == appt_uuid,
-            models.Appointment.patient_id == user_id
-        ).first()
+        result = await db.execute(
+            select(models.Appointment).filter(
+                models.Appointment.appt_id == appt_uuid,
+                models.Appointment.patient_id == user_id
+            )
+        )
+        appointment = result.scalars().first()
 
         if not appointment:
             raise HTTPException(status_code=404, detail="Appointment not found or not authorized")
 
     else:
-        appointment = db.query(models.Appointment).filter(
-            models.Appointment.appt_id == appt_uuid
-        ).first()
+        appointment = await db.get(models.Appointment, appt_uuid)
 
         if not appointment:
             raise HTTPException(status_code=404, detail="Appointment not found")
 
-    db.delete(appointment)
-    db.commit()
+    payload = appointment_payload(appointment)
+    # Its reminder jobs reference it by foreign key, so they go first
+    await db.execute(delete(models.ReminderOutbox).where(models.ReminderOutbox.appt_id == appt_uuid))
+    await db.delete(appointment)
+    await db.run_sync(apply_rollup, [payload])
+    await db.commit()
+    publish_appointment("appointment.deleted", payload)
+    if payload["status"] in ACTIVE_STATUSES:
+        await offer_released_slot(db, payload)
 
     return {"message": "Appointment deleted successfully"}
@@ -1,50 +1,90 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from ..database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
 from ..models.user import User
 from ..schemas.user import UserCreate, UserLogin, UserOut, UserUpdate, UserProfile
-from ..utils.hashing import hash_password, verify_password
-from ..utils.jwt_token import create_access_token, get_current_user
+from ..utils.hashing import HashingPoolFull, hash_password_async, verify_and_update_password_async
+from ..utils.jwt_token import create_access_token, get_current_user, token_cache, user_cache
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+
+def _hashing_busy(exc: HashingPoolFull) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please retry shortly",
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 @router.post("/register", response_model=dict)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == user.email).first()
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(User).filter(User.email == user.email))
+    existing = result.scalars().first()
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
+    # bcrypt runs on its own bounded pool, off the event loop
+    try:
+        hashed_password = await hash_password_async(user.password)
+    except HashingPoolFull as exc:
+        raise _hashing_busy(exc)
+
     new_user = User(
         name=user.name,
         email=user.email,
-        hashed_password=hash_password(user.password),
+        hashed_password=hashed_password,
         role=user.role
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     token = create_access_token({"user_id": str(new_user.id), "role": new_user.role, "name": new_user.name})
     return {"access_token": token, "token_type": "bearer"}
 
 @router.post("/login", response_model=dict)
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+async def login(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(User).filter(User.email == user.email))
+    db_user = result.scalars().first()
+    if not db_user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    try:
+        valid, new_hash = await verify_and_update_password_async(user.password, db_user.hashed_password)
+    except HashingPoolFull as exc:
+        raise _hashing_busy(exc)
+
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # Stored hash used a different bcrypt cost; upgrade it now that we have the password
+    if new_hash:
+        db_user.hashed_password = new_hash
+        await db.commit()
+
     token = create_access_token({"user_id": str(db_user.id), "role": db_user.role, "name": db_user.name})
     return {"access_token": token, "token_type": "bearer"}
 
 @router.get("/profile", response_model=UserProfile)
-def get_profile(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_profile(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     return current_user
 
 @router.put("/profile", response_model=UserProfile)
-def update_profile(user_update: UserUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def update_profile(user_update: UserUpdate, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    # current_user may be a shared cached instance; edit a session-bound copy
+    user = await db.get(User, current_user.id)
     for field, value in user_update.model_dump(exclude_unset=True).items():
         if field == 'date_of_birth' and value == "":
             value = None
-        setattr(current_user, field, value)
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+        setattr(user, field, value)
+    await db.commit()
+    await db.refresh(user)
+    user_cache.invalidate(user.id)
+    return user
+
+@router.get("/cache/stats", response_model=dict)
+async def get_cache_stats(current_user: User = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to view cache statistics")
+    return {"users": user_cache.stats(), "tokens": token_cache.stats()}
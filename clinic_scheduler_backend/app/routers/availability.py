@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_async_read_db
+from .. import schemas
+from ..services.availability import search_availability
+from ..services.conflicts import MAX_APPOINTMENT_DURATION
+from ..utils.datetimes import to_naive_utc
+
+router = APIRouter(prefix="/availability", tags=["Availability"])
+
+# Longest window a single search may cover
+MAX_SEARCH_WINDOW = timedelta(days=31)
+
+
+@router.get("/", response_model=schemas.Availability)
+async def get_availability(
+    clinic_id: UUID,
+    start: datetime = Query(..., alias="from"),
+    end: datetime = Query(..., alias="to"),
+    duration: int = Query(30, ge=5, description="Slot length in minutes"),
+    step: int = Query(15, ge=5, description="Spacing between candidate start times in minutes"),
+    room_id: UUID | None = None,
+    provider_id: UUID | None = None,
+    limit: int = Query(200, ge=1, le=2000),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    start = to_naive_utc(start)
+    end = to_naive_utc(end)
+
+    if end <= start:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    if end - start > MAX_SEARCH_WINDOW:
+        raise HTTPException(status_code=400, detail="Search window cannot exceed 31 days")
+
+    slot_length = timedelta(minutes=duration)
+    if slot_length > MAX_APPOINTMENT_DURATION:
+        raise HTTPException(status_code=400, detail="Duration is longer than the maximum allowed appointment")
+
+    slots = await db.run_sync(
+        search_availability,
+        clinic_id=clinic_id,
+        start_time=start,
+        end_time=end,
+        duration=slot_length,
+        step=timedelta(minutes=step),
+        limit=limit,
+        room_id=room_id,
+        provider_id=provider_id,
+    )
+
+    return {
+        "clinic_id": clinic_id,
+        "start_time": start,
+        "end_time": end,
+        "duration_minutes": duration,
+        "slots": [slot._asdict() for slot in slots],
+    }
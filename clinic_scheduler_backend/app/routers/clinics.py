@@ -1,26 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from ..database import get_async_db, get_async_read_db
 from .. import models, schemas
+from ..utils.refcache import reference_cache
 
 router = APIRouter(prefix="/clinics", tags=["Clinics"])
 
 @router.post("/", response_model=schemas.Clinic)
-def create_clinic(clinic: schemas.ClinicCreate, db: Session = Depends(get_db)):
+async def create_clinic(clinic: schemas.ClinicCreate, db: AsyncSession = Depends(get_async_db)):
     new_clinic = models.Clinic(**clinic.dict())
     db.add(new_clinic)
-    db.commit()
-    db.refresh(new_clinic)
+    await db.commit()
+    await db.refresh(new_clinic)
+    reference_cache.invalidate("clinics")
     return new_clinic
 
 @router.get("/", response_model=list[schemas.Clinic])
-def get_clinics(db: Session = Depends(get_db)):
-    clinics = db.query(models.Clinic).all()
-    return clinics
+async def get_clinics(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    async def load():
+        result = await db.execute(select(models.Clinic))
+        return result.scalars().all()
+
+    return await reference_cache.respond(request, "clinics", "all", list[schemas.Clinic], load)
 
 @router.get("/{clinic_id}", response_model=schemas.Clinic)
-def get_clinic(clinic_id: str, db: Session = Depends(get_db)):
-    clinic = db.query(models.Clinic).filter(models.Clinic.id == clinic_id).first()
-    if not clinic:
-        raise HTTPException(status_code=404, detail="Clinic not found")
-    return clinic
+async def get_clinic(clinic_id: UUID, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    async def load():
+        clinic = await db.get(models.Clinic, clinic_id)
+        if not clinic:
+            raise HTTPException(status_code=404, detail="Clinic not found")
+        return clinic
+
+    return await reference_cache.respond(request, "clinics", str(clinic_id), schemas.Clinic, load)
@@ -0,0 +1,75 @@
+import asyncio
+import os
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from ..utils.events import event_hub
+from ..utils.jwt_token import verify_token
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+# Comment line sent when idle so proxies keep the connection open
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", 15))
+
+optional_bearer = HTTPBearer(auto_error=False)
+
+
+async def get_stream_payload(
+    access_token: str | None = Query(None, description="For EventSource, which cannot send headers"),
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_bearer),
+):
+    token = credentials.credentials if credentials else access_token
+    payload = verify_token(token) if token else None
+    if not payload:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return payload
+
+
+@router.get("/appointments")
+async def stream_appointment_events(
+    request: Request,
+    clinic_id: UUID | None = None,
+    provider_id: UUID | None = None,
+    patient_id: UUID | None = None,
+    current_user: dict = Depends(get_stream_payload)
+):
+    """
+    Server-sent events for appointment changes in one clinic, provider or
+    patient schedule: appointment.created, appointment.status,
+    appointment.updated (moved or reassigned; also sent to the old provider
+    and patient) and appointment.deleted, each carrying the appointment's
+    fields. A resync event means deltas were dropped and the client should
+    refetch.
+    """
+    scopes = [(name, value) for name, value in (
+        ("clinic", clinic_id), ("provider", provider_id), ("patient", patient_id)
+    ) if value is not None]
+    if len(scopes) != 1:
+        raise HTTPException(status_code=400, detail="Give exactly one of clinic_id, provider_id or patient_id")
+    scope, scope_id = scopes[0]
+
+    if current_user.get("role") not in ["staff", "admin"]:
+        if scope != "patient" or str(scope_id) != current_user.get("user_id"):
+            raise HTTPException(status_code=403, detail="Patients can only follow their own appointments")
+
+    subscription = event_hub.subscribe((scope, str(scope_id)))
+
+    async def stream():
+        try:
+            yield b"retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    yield await asyncio.wait_for(subscription.queue.get(), EVENT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,52 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..utils.events import event_hub
+from ..services.waitlist import waitlist_index
+from ..utils.hashing import hashing_pool
+from ..utils.jwt_token import token_cache, user_cache
+from ..utils.metrics import metrics
+from ..utils.ratelimit import rate_limit_backend, rate_limit_stats
+
+router = APIRouter(tags=["Metrics"])
+
+CACHES = {"users": user_cache, "tokens": token_cache}
+
+
+def _cache_stat(field: str):
+    return lambda: {f'cache="{name}"': cache.stats()[field] for name, cache in CACHES.items()}
+
+
+metrics.register("cache_hits_total", "Cache lookups that found a live entry", "counter", _cache_stat("hits"))
+metrics.register("cache_misses_total", "Cache lookups that found nothing or an expired entry", "counter", _cache_stat("misses"))
+metrics.register("cache_evictions_total", "Entries dropped to stay within maxsize", "counter", _cache_stat("evictions"))
+metrics.register("cache_entries", "Entries currently held", "gauge", _cache_stat("size"))
+metrics.register("hashing_in_flight", "bcrypt jobs running or queued", "gauge", lambda: {"": hashing_pool.in_flight})
+metrics.register("hashing_capacity", "bcrypt jobs admitted before requests get 503", "gauge", lambda: {"": hashing_pool.capacity})
+
+def _reminder_counts():
+    # The dispatcher is loaded lazily (REMINDER_WORKER), so its module is too
+    from ..services.reminders import reminder_stats
+    return {f'result="{result}"': count for result, count in reminder_stats.items()}
+
+
+metrics.register("reminders_total", "Reminder jobs handled by this process's dispatcher", "counter", _reminder_counts)
+
+metrics.register("rate_limited_total", "Requests refused with 429 by the rate limiter", "counter", lambda: dict(rate_limit_stats))
+metrics.register(
+    "rate_limit_in_flight", "Requests in flight on concurrency-capped routes", "gauge",
+    lambda: {f'route="{key.split(":")[0]}"': count for key, count in rate_limit_backend.stats().get("in_flight", {}).items()},
+)
+
+metrics.register("event_subscribers", "Open server-sent event streams", "gauge", lambda: {"": event_hub.stats()["subscribers"]})
+
+metrics.register(
+    "waitlist_index_entries", "Waiting entries held in this process's in-memory waitlist index", "gauge",
+    lambda: {"": waitlist_index.stats()["entries"]},
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Prometheus text exposition of request, SQL, cache and hashing metrics."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,26 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from ..database import get_async_db, get_async_read_db
 from .. import models, schemas
+from ..utils.refcache import reference_cache
 
 router = APIRouter(prefix="/providers", tags=["Providers"])
 
 @router.post("/", response_model=schemas.Provider)
-def create_provider(provider: schemas.ProviderCreate, db: Session = Depends(get_db)):
+async def create_provider(provider: schemas.ProviderCreate, db: AsyncSession = Depends(get_async_db)):
     new_provider = models.Provider(**provider.dict())
     db.add(new_provider)
-    db.commit()
-    db.refresh(new_provider)
+    await db.commit()
+    await db.refresh(new_provider)
+    reference_cache.invalidate("providers")
     return new_provider
 
 @router.get("/", response_model=list[schemas.Provider])
-def get_providers(db: Session = Depends(get_db)):
-    providers = db.query(models.Provider).all()
-    return providers
+async def get_providers(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    async def load():
+        result = await db.execute(select(models.Provider))
+        return result.scalars().all()
+
+    return await reference_cache.respond(request, "providers", "all", list[schemas.Provider], load)
 
 @router.get("/{provider_id}", response_model=schemas.Provider)
-def get_provider(provider_id: str, db: Session = Depends(get_db)):
-    provider = db.query(models.Provider).filter(models.Provider.id == provider_id).first()
-    if not provider:
-        raise HTTPException(status_code=404, detail="Provider not found")
-    return provider
+async def get_provider(provider_id: UUID, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    async def load():
+        provider = await db.get(models.Provider, provider_id)
+        if not provider:
+            raise HTTPException(status_code=404, detail="Provider not found")
+        return provider
+
+    return await reference_cache.respond(request, "providers", str(provider_id), schemas.Provider, load)
@@ -0,0 +1,192 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_async_db, get_async_read_db
+from .. import models, schemas
+from ..utils.jwt_token import get_token_payload as get_current_user
+from ..services.booking import with_write_lock
+from ..services.rollups import rebuild_rollup, utilization_report
+from ..utils.datetimes import to_naive_utc
+from ..utils.fastjson import json_response
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+# group_by names accepted by the API and the rollup column each maps to
+GROUP_DIMENSIONS = {
+    "day": "day",
+    "clinic": "clinic_id",
+    "room": "room_id",
+    "provider": "provider_id",
+    "status": "status",
+}
+
+# Longest range a single report may cover
+MAX_REPORT_WINDOW = timedelta(days=366 * 3)
+
+# Released slots; no-shows still held the room and provider
+EXCLUDED_BY_DEFAULT = (models.StatusEnum.cancelled.value,)
+
+# Longest window for the appointment-level analytics, and the largest
+# heatmap (resources x buckets) a single response may carry
+MAX_ANALYTICS_WINDOW = timedelta(days=366)
+MAX_HEATMAP_CELLS = 2_000_000
+
+
+def parse_group_by(
+    group_by: str = Query("day,clinic", description="Comma-separated: " + ", ".join(GROUP_DIMENSIONS))
+) -> tuple[str, ...]:
+    names = [name.strip() for name in group_by.split(",") if name.strip()]
+    unknown = [name for name in names if name not in GROUP_DIMENSIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown group_by: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(names))
+
+
+# ---------------- UTILIZATION ----------------
+@router.get("/utilization", response_model=schemas.UtilizationReport)
+async def get_utilization(
+    date_from: date,
+    date_to: date = Query(..., description="Exclusive"),
+    group_by: tuple[str, ...] = Depends(parse_group_by),
+    clinic_id: UUID | None = None,
+    room_id: UUID | None = None,
+    provider_id: UUID | None = None,
+    include_cancelled: bool = Query(False, description="Also count cancelled appointments"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Appointment counts and booked minutes from the daily utilization
+    rollup, summed over [date_from, date_to) and grouped by the given
+    dimensions. Reads rollup rows (one per clinic/day/room/provider/status)
+    instead of appointments.
+    """
+    if current_user.get("role") not in ["staff", "admin"]:
+        raise HTTPException(status_code=403, detail="Not authorized to view reports")
+    if date_to <= date_from:
+        raise HTTPException(status_code=400, detail="date_to must be after date_from")
+    if date_to - date_from > MAX_REPORT_WINDOW:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_REPORT_WINDOW.days} days")
+
+    statuses = None
+    if not include_cancelled:
+        statuses = tuple(e.value for e in models.StatusEnum if e.value not in EXCLUDED_BY_DEFAULT)
+
+    rows = await db.run_sync(
+        utilization_report,
+        date_from,
+        date_to,
+        tuple(GROUP_DIMENSIONS[name] for name in group_by),
+        clinic_id=clinic_id,
+        room_id=room_id,
+        provider_id=provider_id,
+        statuses=statuses,
+    )
+    return {"date_from": date_from, "date_to": date_to, "group_by": list(group_by), "rows": rows}
+
+
+# ---------------- REBUILD ----------------
+@router.post("/utilization/rebuild", response_model=schemas.RollupRebuildResult)
+async def rebuild_utilization(
+    date_from: date | None = None,
+    date_to: date | None = Query(None, description="Exclusive"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Recompute the rollup from the appointments and archive tables (all dates when omitted)."""
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can rebuild reports")
+
+    try:
+        # Under the booking write lock so no booking lands between the
+        # appointment scan and the rollup rewrite
+        rows = await with_write_lock(db, lambda: db.run_sync(rebuild_rollup, date_from, date_to))
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    return {"date_from": date_from, "date_to": date_to, "rows": rows}
+
+
+def analytics_window(date_from: datetime, date_to: datetime) -> tuple[datetime, datetime]:
+    date_from, date_to = to_naive_utc(date_from), to_naive_utc(date_to)
+    if date_to <= date_from:
+        raise HTTPException(status_code=400, detail="date_to must be after date_from")
+    if date_to - date_from > MAX_ANALYTICS_WINDOW:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_ANALYTICS_WINDOW.days} days")
+    return date_from, date_to
+
+
+# ---------------- OCCUPANCY ----------------
+@router.get("/occupancy")
+async def get_occupancy(
+    request: Request,
+    date_from: datetime,
+    date_to: datetime,
+    bucket_minutes: int = Query(15, ge=5, le=1440),
+    by: str = Query("room", pattern="^(room|provider)$"),
+    clinic_id: UUID | None = None,
+    open_hour: int = Query(0, ge=0, le=23, description="Start of the daily hours counted as capacity"),
+    close_hour: int = Query(24, ge=1, le=24, description="End of the daily hours counted as capacity"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Occupancy heatmap: occupied minutes per room or provider in each
+    bucket_minutes bucket from date_from, each resource's utilization of
+    the open_hour-close_hour capacity, and the peak number of simultaneous
+    appointments per bucket. Cancelled appointments are not counted.
+    """
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can view analytics")
+    date_from, date_to = analytics_window(date_from, date_to)
+    if close_hour <= open_hour:
+        raise HTTPException(status_code=400, detail="close_hour must be after open_hour")
+    # Imported on first use: NumPy alone adds ~130ms to every worker's boot
+    from ..services.analytics import load_columns, occupancy_report
+
+    buckets = -(-int((date_to - date_from).total_seconds() // 60) // bucket_minutes)
+    columns = await db.run_sync(load_columns, date_from, date_to, clinic_id=clinic_id)
+    resources = len(columns.room_ids if by == "room" else columns.provider_ids)
+    if resources * buckets > MAX_HEATMAP_CELLS:
+        raise HTTPException(status_code=400, detail="Heatmap too large; use larger buckets, a shorter range or a clinic_id")
+
+    # The array work runs off the event loop
+    report = await asyncio.to_thread(
+        occupancy_report, columns, date_from, bucket_minutes, buckets, by, open_hour, close_hour
+    )
+    return json_response(request, {
+        "date_from": date_from,
+        "date_to": date_to,
+        "bucket_minutes": bucket_minutes,
+        "buckets": buckets,
+        "by": by,
+        **report,
+    })
+
+
+# ---------------- WAIT TIMES ----------------
+@router.get("/wait-times")
+async def get_wait_times(
+    request: Request,
+    date_from: datetime,
+    date_to: datetime,
+    clinic_id: UUID | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Booking lead time (hours from created_at to start_time) percentiles per
+    clinic and across all clinics, for appointments in the range.
+    """
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can view analytics")
+    date_from, date_to = analytics_window(date_from, date_to)
+    from ..services.analytics import load_columns, wait_time_report
+
+    columns = await db.run_sync(load_columns, date_from, date_to, clinic_id=clinic_id)
+    clinics = await asyncio.to_thread(wait_time_report, columns)
+    return json_response(request, {"date_from": date_from, "date_to": date_to, "clinics": clinics})
@@ -1,26 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from ..database import get_async_db, get_async_read_db
 from .. import models, schemas
+from ..utils.refcache import reference_cache
 
 router = APIRouter(prefix="/rooms", tags=["Rooms"])
 
 @router.post("/", response_model=schemas.Room)
-def create_room(room: schemas.RoomCreate, db: Session = Depends(get_db)):
+async def create_room(room: schemas.RoomCreate, db: AsyncSession = Depends(get_async_db)):
     new_room = models.Room(**room.dict())
     db.add(new_room)
-    db.commit()
-    db.refresh(new_room)
+    await db.commit()
+    await db.refresh(new_room)
+    reference_cache.invalidate("rooms")
     return new_room
 
 @router.get("/", response_model=list[schemas.Room])
-def get_rooms(db: Session = Depends(get_db)):
-    rooms = db.query(models.Room).all()
-    return rooms
+async def get_rooms(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    async def load():
+        result = await db.execute(select(models.Room))
+        return result.scalars().all()
+
+    return await reference_cache.respond(request, "rooms", "all", list[schemas.Room], load)
 
 @router.get("/{room_id}", response_model=schemas.Room)
-def get_room(room_id: str, db: Session = Depends(get_db)):
-    room = db.query(models.Room).filter(models.Room.id == room_id).first()
-    if not room:
-        raise HTTPException(status_code=404, detail="Room not found")
-    return room
+async def get_room(room_id: UUID, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    async def load():
+        room = await db.get(models.Room, room_id)
+        if not room:
+            raise HTTPException(status_code=404, detail="Room not found")
+        return room
+
+    return await reference_cache.respond(request, "rooms", str(room_id), schemas.Room, load)
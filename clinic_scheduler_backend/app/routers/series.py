@@ -0,0 +1,151 @@
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_async_db
+from .. import models, schemas
+from ..utils.jwt_token import get_token_payload as get_current_user
+from ..utils.datetimes import to_naive_utc
+from ..utils.events import publish_appointment
+from ..services.booking import BookingConflict, with_write_lock
+from ..services.conflicts import MAX_APPOINTMENT_DURATION
+from ..services.series import (
+    SeriesConflict, cancel_series, create_series, expand_occurrences, move_series
+)
+from ..services.waitlist import offer_released_slot
+
+router = APIRouter(prefix="/series", tags=["Series"])
+
+
+def occurrence_report(decisions, occurrences) -> list[dict]:
+    return [
+        {**decision._asdict(), "start_time": start, "end_time": end}
+        for decision, (start, end) in zip(decisions, occurrences)
+    ]
+
+
+async def get_series_or_404(db: AsyncSession, series_id: UUID) -> models.AppointmentSeries:
+    record = await db.get(models.AppointmentSeries, series_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Series not found")
+    return record
+
+
+# ---------------- CREATE ----------------
+@router.post("/", response_model=schemas.SeriesBookingResult)
+async def create_appointment_series(
+    series: schemas.SeriesCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+
+    if current_user.get("role") not in ["staff", "admin"]:
+        raise HTTPException(status_code=403, detail="Not authorized to book appointment series")
+
+    if series.end_time <= series.start_time:
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+
+    if series.end_time - series.start_time > MAX_APPOINTMENT_DURATION:
+        raise HTTPException(status_code=400, detail="Appointment is longer than the maximum allowed duration")
+
+    try:
+        occurrences = expand_occurrences(
+            series.start_time, series.end_time, series.frequency,
+            series.interval, series.count, series.until,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def book():
+        return await db.run_sync(create_series, series, occurrences)
+
+    try:
+        record, decisions, rows = await with_write_lock(db, book)
+    except SeriesConflict as e:
+        raise HTTPException(status_code=409, detail=jsonable_encoder({
+            "message": "Series not booked: occurrences conflict with existing appointments",
+            "occurrences": occurrence_report(e.decisions, occurrences),
+        }))
+    except BookingConflict as e:
+        raise HTTPException(
+            status_code=409,
+            detail=f"A concurrent booking took a slot in this series ({e}); retry the series"
+        )
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    for row in rows:
+        publish_appointment("appointment.created", row)
+    created = sum(1 for decision in decisions if decision.status == "created")
+    return {
+        "series": record,
+        "created": created,
+        "conflicts": len(decisions) - created,
+        "occurrences": occurrence_report(decisions, occurrences),
+    }
+
+
+# ---------------- CANCEL ----------------
+@router.post("/{series_id}/cancel", response_model=schemas.SeriesUpdateResult)
+async def cancel_appointment_series(
+    series_id: UUID,
+    from_time: datetime | None = Query(None, alias="from", description="Cancel occurrences from this time on (default: now)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+
+    from_time = to_naive_utc(from_time) if from_time else datetime.utcnow()
+
+    async def cancel():
+        record = await get_series_or_404(db, series_id)
+        if current_user.get("role") not in ["staff", "admin"] and str(record.patient_id) != current_user.get("user_id"):
+            raise HTTPException(status_code=403, detail="Not authorized to cancel this series")
+        return await db.run_sync(cancel_series, series_id, from_time)
+
+    cancelled = await with_write_lock(db, cancel)
+    for row in cancelled:
+        publish_appointment("appointment.status", {**row, "status": models.StatusEnum.cancelled})
+    # Each freed slot goes to the waitlist, as a single cancellation does
+    for row in cancelled:
+        await offer_released_slot(db, row)
+
+    return {"series_id": series_id, "updated": len(cancelled)}
+
+
+# ---------------- MOVE ----------------
+@router.post("/{series_id}/move", response_model=schemas.SeriesUpdateResult)
+async def move_appointment_series(
+    series_id: UUID,
+    move: schemas.SeriesMove,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+
+    if current_user.get("role") not in ["staff", "admin"]:
+        raise HTTPException(status_code=403, detail="Not authorized to move appointment series")
+
+    from_time = move.from_time or datetime.utcnow()
+
+    async def shift():
+        record = await get_series_or_404(db, series_id)
+        return await db.run_sync(move_series, record, move, from_time)
+
+    try:
+        decisions, positions, moved = await with_write_lock(db, shift)
+    except BookingConflict as e:
+        raise HTTPException(status_code=409, detail=f"Time slot conflicts with existing appointment ({e})")
+
+    if decisions and not moved:
+        report = occurrence_report(decisions, positions)
+        raise HTTPException(status_code=409, detail=jsonable_encoder({
+            "message": "Series not moved: occurrences would conflict with existing appointments",
+            "occurrences": [item for item in report if item["status"] != "created"],
+        }))
+
+    for before, after in moved:
+        publish_appointment("appointment.updated", after, previous=before)
+    return {"series_id": series_id, "updated": len(moved)}
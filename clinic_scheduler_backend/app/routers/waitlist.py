@@ -0,0 +1,196 @@
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_async_db, get_async_read_db
+from .. import models, schemas
+from ..utils.jwt_token import get_token_payload as get_current_user
+from ..services.booking import BookingConflict, insert_appointment, with_write_lock
+from ..services.waitlist import (
+    WAITLIST_MAX_WINDOW_DAYS, FreedSlot, WaitlistItem, offer_freed_slot, publish_offer, waitlist_index
+)
+from .appointments import appointment_payload
+from ..utils.events import publish_appointment
+
+router = APIRouter(prefix="/waitlist", tags=["Waitlist"])
+
+
+def is_staff(current_user: dict) -> bool:
+    return current_user.get("role") in ["staff", "admin"]
+
+
+async def get_entry_or_404(db: AsyncSession, entry_id: UUID, current_user: dict) -> models.WaitlistEntry:
+    entry = await db.get(models.WaitlistEntry, entry_id)
+    if not entry or (not is_staff(current_user) and str(entry.patient_id) != current_user.get("user_id")):
+        raise HTTPException(status_code=404, detail="Waitlist entry not found")
+    return entry
+
+
+async def requeue(db: AsyncSession, entry: models.WaitlistEntry):
+    """Put an entry whose offer fell through back in the queue."""
+    entry.status = "waiting"
+    entry.offered_room_id = entry.offered_provider_id = None
+    entry.offered_start = entry.offered_end = entry.offer_expires_at = None
+    await db.commit()
+    await db.refresh(entry)
+    waitlist_index.add(WaitlistItem.from_entry(entry))
+
+
+async def pass_offer_on(db: AsyncSession, entry: models.WaitlistEntry):
+    """Offer an entry's declined or abandoned slot to the next match. The caller commits."""
+    slot = FreedSlot(
+        entry.clinic_id, entry.offered_room_id, entry.offered_provider_id, entry.offered_start, entry.offered_end
+    )
+    return await db.run_sync(offer_freed_slot, slot, exclude={entry.entry_id})
+
+
+# ---------------- JOIN ----------------
+@router.post("/", response_model=schemas.WaitlistEntry)
+async def join_waitlist(
+    request: schemas.WaitlistCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+
+    if is_staff(current_user):
+        if request.patient_id is None:
+            raise HTTPException(status_code=400, detail="patient_id is required")
+        patient_id, priority = request.patient_id, request.priority
+    else:
+        if request.patient_id is not None and str(request.patient_id) != current_user.get("user_id"):
+            raise HTTPException(status_code=403, detail="Patients can only join the waitlist for themselves")
+        # Priority is a triage decision made by staff
+        patient_id, priority = UUID(current_user.get("user_id")), 0
+
+    if request.latest <= datetime.utcnow():
+        raise HTTPException(status_code=400, detail="The window has already passed")
+    if request.latest - request.earliest > timedelta(days=WAITLIST_MAX_WINDOW_DAYS):
+        raise HTTPException(status_code=400, detail=f"The window cannot exceed {WAITLIST_MAX_WINDOW_DAYS} days")
+
+    entry = models.WaitlistEntry(
+        entry_id=uuid4(),
+        clinic_id=request.clinic_id,
+        provider_id=request.provider_id,
+        patient_id=patient_id,
+        earliest=request.earliest,
+        latest=request.latest,
+        duration_minutes=request.duration_minutes,
+        priority=priority,
+        status="waiting",
+    )
+    db.add(entry)
+    try:
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    await db.refresh(entry)
+    waitlist_index.add(WaitlistItem.from_entry(entry))
+    return entry
+
+
+# ---------------- LIST ----------------
+@router.get("/", response_model=list[schemas.WaitlistEntry])
+async def list_waitlist(
+    clinic_id: UUID | None = None,
+    status: str | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Staff see every entry (filterable); patients see their own."""
+    Entry = models.WaitlistEntry
+    query = select(Entry).order_by(Entry.priority.desc(), Entry.created_at)
+    if not is_staff(current_user):
+        query = query.where(Entry.patient_id == UUID(current_user.get("user_id")))
+    if clinic_id is not None:
+        query = query.where(Entry.clinic_id == clinic_id)
+    if status is not None:
+        query = query.where(Entry.status == status)
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+# ---------------- ACCEPT ----------------
+@router.post("/{entry_id}/accept", response_model=schemas.WaitlistEntry)
+async def accept_offer(
+    entry_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Book the offered slot; the entry is re-queued if it was taken meanwhile."""
+
+    async def book():
+        entry = await get_entry_or_404(db, entry_id, current_user)
+        if entry.status != "offered":
+            raise HTTPException(status_code=409, detail="This entry has no open offer")
+        if entry.offer_expires_at <= datetime.utcnow():
+            raise HTTPException(status_code=409, detail="The offer has expired")
+
+        appointment = await insert_appointment(db, {
+            "appt_id": uuid4(),
+            "clinic_id": entry.clinic_id,
+            "room_id": entry.offered_room_id,
+            "patient_id": entry.patient_id,
+            "provider_id": entry.offered_provider_id,
+            "start_time": entry.offered_start,
+            "end_time": entry.offered_end,
+        })
+        entry.status = "booked"
+        entry.appt_id = appointment.appt_id
+        return entry, appointment
+
+    try:
+        entry, appointment = await with_write_lock(db, book)
+    except BookingConflict as e:
+        entry = await get_entry_or_404(db, entry_id, current_user)
+        await requeue(db, entry)
+        raise HTTPException(status_code=409, detail=f"The slot was taken meanwhile ({e}); you are back on the waitlist")
+
+    await db.refresh(appointment)
+    await db.refresh(entry)
+    publish_appointment("appointment.created", appointment_payload(appointment))
+    return entry
+
+
+# ---------------- DECLINE ----------------
+@router.post("/{entry_id}/decline", response_model=schemas.WaitlistEntry)
+async def decline_offer(
+    entry_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Turn the offer down and stay on the waitlist; the slot goes to the next match."""
+    entry = await get_entry_or_404(db, entry_id, current_user)
+    if entry.status != "offered":
+        raise HTTPException(status_code=409, detail="This entry has no open offer")
+
+    offer = await pass_offer_on(db, entry)
+    await requeue(db, entry)
+    if offer is not None:
+        publish_offer(offer)
+    return entry
+
+
+# ---------------- WITHDRAW ----------------
+@router.delete("/{entry_id}", response_model=schemas.WaitlistEntry)
+async def withdraw_from_waitlist(
+    entry_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+
+    entry = await get_entry_or_404(db, entry_id, current_user)
+    if entry.status not in ("waiting", "offered"):
+        raise HTTPException(status_code=409, detail=f"Entry is already {entry.status}")
+
+    offer = await pass_offer_on(db, entry) if entry.status == "offered" else None
+    entry.status = "withdrawn"
+    await db.commit()
+    await db.refresh(entry)
+    waitlist_index.discard(entry.clinic_id, entry.entry_id)
+    if offer is not None:
+        publish_offer(offer)
+    return entry
@@ -0,0 +1,72 @@
+import logging
+import os
+import re
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_DIR = Path(__file__).resolve().parent.parent / "alembic"
+
+# strict: refuse to start on a schema mismatch, warn: log and continue, off: skip
+SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "strict").lower()
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+_REVISION_RE = re.compile(r'^revision: str = "([^"]+)"', re.MULTILINE)
+_DOWN_REVISION_RE = re.compile(r'^down_revision: [^=]+= (?:"([^"]+)"|None)', re.MULTILINE)
+
+
+def expected_revision() -> str | None:
+    """
+    Head revision of the migration scripts shipped with this build. The
+    version files are scanned as text, which avoids importing Alembic (its
+    import alone costs more than the rest of worker start-up).
+    """
+    revisions, parents = set(), set()
+    for path in (ALEMBIC_DIR / "versions").glob("*.py"):
+        source = path.read_text()
+        revision = _REVISION_RE.search(source)
+        if revision:
+            revisions.add(revision.group(1))
+            down = _DOWN_REVISION_RE.search(source)
+            if down and down.group(1):
+                parents.add(down.group(1))
+    heads = revisions - parents
+    if len(heads) > 1:
+        raise SchemaVersionError(f"Multiple migration heads: {sorted(heads)}")
+    return heads.pop() if heads else None
+
+
+async def check_schema_version(engine):
+    """
+    One cheap SELECT against alembic_version at startup, instead of
+    running DDL from every worker. Migrations are applied once per deploy
+    with `alembic upgrade head`.
+    """
+    if SCHEMA_CHECK == "off":
+        return
+
+    expected = expected_revision()
+    try:
+        async with engine.connect() as conn:
+            current = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+    except DBAPIError:
+        current = None
+
+    if current == expected:
+        return
+
+    message = (
+        f"Database schema is at revision {current or 'none'}, this build expects {expected}. "
+        "Run `alembic upgrade head` (or `python migrate_db.py` for a pre-migration database)."
+    )
+    if SCHEMA_CHECK == "warn":
+        logger.warning(message)
+    else:
+        raise SchemaVersionError(message)
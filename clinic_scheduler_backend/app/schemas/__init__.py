@@ -1,13 +1,23 @@
-from .appointment import Appointment, AppointmentCreate, AppointmentBase
-from .user import UserCreate, UserOut
+from .appointment import Appointment, AppointmentCreate, AppointmentBase, AppointmentExpanded, BulkBookingResult
+from .user import UserCreate, UserOut, UserSummary
 from .clinic import Clinic, ClinicCreate
 from .room import Room, RoomCreate
 from .provider import Provider, ProviderCreate
+from .availability import Availability, AvailabilitySlot
+from .series import (
+    AppointmentSeries, SeriesBookingResult, SeriesCreate, SeriesMove, SeriesOccurrence, SeriesUpdateResult
+)
+from .report import RollupRebuildResult, UtilizationReport, UtilizationRow
+from .waitlist import WaitlistCreate, WaitlistEntry
 
 __all__ = [
-    "Appointment", "AppointmentCreate", "AppointmentBase",
-    "UserCreate", "UserOut",
+    "Appointment", "AppointmentCreate", "AppointmentBase", "AppointmentExpanded", "BulkBookingResult",
+    "UserCreate", "UserOut", "UserSummary",
     "Clinic", "ClinicCreate",
     "Room", "RoomCreate",
-    "Provider", "ProviderCreate"
+    "Provider", "ProviderCreate",
+    "Availability", "AvailabilitySlot",
+    "AppointmentSeries", "SeriesBookingResult", "SeriesCreate", "SeriesMove", "SeriesOccurrence", "SeriesUpdateResult",
+    "RollupRebuildResult", "UtilizationReport", "UtilizationRow",
+    "WaitlistCreate", "WaitlistEntry",
     ]
@@ -1,6 +1,11 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from datetime import datetime
 import uuid
+from ..utils.datetimes import to_naive_utc
+from .clinic import Clinic
+from .room import Room
+from .provider import Provider
+from .user import UserSummary
 
 class AppointmentBase(BaseModel):
     clinic_id: uuid.UUID
@@ -10,11 +15,29 @@ class AppointmentBase(BaseModel):
     start_time: datetime
     end_time: datetime
 
+    @field_validator("start_time", "end_time")
+    def normalize_timezone(cls, v):
+        return to_naive_utc(v)
+
 class AppointmentCreate(AppointmentBase):
     pass
 
 class Appointment(AppointmentBase):
     appt_id: uuid.UUID
     status: str
+    series_id: uuid.UUID | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class AppointmentExpanded(Appointment):
+    """Appointment with the related records named in ?expand= nested inline."""
+    patient: UserSummary | None = None
+    clinic: Clinic | None = None
+    room: Room | None = None
+    provider: Provider | None = None
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+class BulkBookingResult(BaseModel):
+    index: int
+    status: str  # created, conflict or invalid
+    appt_id: uuid.UUID | None = None
+    detail: str | None = None
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from datetime import datetime
+import uuid
+
+class AvailabilitySlot(BaseModel):
+    start_time: datetime
+    end_time: datetime
+    room_id: uuid.UUID
+    provider_id: uuid.UUID
+
+class Availability(BaseModel):
+    clinic_id: uuid.UUID
+    start_time: datetime
+    end_time: datetime
+    duration_minutes: int
+    slots: list[AvailabilitySlot]
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from datetime import date
+import uuid
+
+class UtilizationRow(BaseModel):
+    # Only the grouped dimensions are filled in
+    day: date | None = None
+    clinic_id: uuid.UUID | None = None
+    room_id: uuid.UUID | None = None
+    provider_id: uuid.UUID | None = None
+    status: str | None = None
+    appointments: int
+    booked_minutes: int
+
+class UtilizationReport(BaseModel):
+    date_from: date
+    date_to: date
+    group_by: list[str]
+    rows: list[UtilizationRow]
+
+class RollupRebuildResult(BaseModel):
+    date_from: date | None = None
+    date_to: date | None = None
+    rows: int
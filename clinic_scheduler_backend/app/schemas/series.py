@@ -0,0 +1,59 @@
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from datetime import datetime
+from typing import Literal
+import uuid
+from ..utils.datetimes import to_naive_utc
+from .appointment import AppointmentBase, BulkBookingResult
+
+class SeriesCreate(AppointmentBase):
+    """First occurrence plus an RRULE-style recurrence; give count or until."""
+    frequency: Literal["daily", "weekly", "monthly"]
+    interval: int = Field(1, ge=1, le=52)
+    count: int | None = Field(None, ge=1)
+    until: datetime | None = None
+    # Book the free occurrences and report the rest, rather than all or nothing
+    allow_partial: bool = True
+
+    @field_validator("until")
+    def normalize_until(cls, v):
+        return to_naive_utc(v) if v is not None else v
+
+    @model_validator(mode="after")
+    def check_end(self):
+        if (self.count is None) == (self.until is None):
+            raise ValueError("Give exactly one of count or until")
+        return self
+
+class AppointmentSeries(AppointmentBase):
+    series_id: uuid.UUID
+    frequency: str
+    interval: int
+    count: int | None = None
+    until: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class SeriesOccurrence(BulkBookingResult):
+    start_time: datetime
+    end_time: datetime
+
+class SeriesBookingResult(BaseModel):
+    series: AppointmentSeries | None = None
+    created: int
+    conflicts: int
+    occurrences: list[SeriesOccurrence]
+
+class SeriesMove(BaseModel):
+    """Shift and/or reassign the active occurrences starting at or after from_time."""
+    shift_minutes: int = 0
+    room_id: uuid.UUID | None = None
+    provider_id: uuid.UUID | None = None
+    from_time: datetime | None = Field(None, description="Defaults to now")
+
+    @field_validator("from_time")
+    def normalize_from(cls, v):
+        return to_naive_utc(v) if v is not None else v
+
+class SeriesUpdateResult(BaseModel):
+    series_id: uuid.UUID
+    updated: int
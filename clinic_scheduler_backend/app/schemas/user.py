@@ -49,3 +49,13 @@ class UserProfile(BaseModel):
     model_config = {
         "from_attributes": True
     }
+
+class UserSummary(BaseModel):
+    id: uuid.UUID
+    name: str
+    email: EmailStr
+    phone: str | None = None
+
+    model_config = {
+        "from_attributes": True
+    }
@@ -0,0 +1,44 @@
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from datetime import datetime
+import uuid
+from ..utils.datetimes import to_naive_utc
+
+class WaitlistCreate(BaseModel):
+    """Wait for a duration_minutes slot anywhere in [earliest, latest]."""
+    clinic_id: uuid.UUID
+    provider_id: uuid.UUID | None = None  # any provider at the clinic
+    patient_id: uuid.UUID | None = None  # staff only; patients join for themselves
+    earliest: datetime
+    latest: datetime
+    duration_minutes: int = Field(30, ge=5, le=480)
+    priority: int = Field(0, ge=0, le=10)  # staff only
+
+    @field_validator("earliest", "latest")
+    def normalize_times(cls, v):
+        return to_naive_utc(v)
+
+    @model_validator(mode="after")
+    def check_window(self):
+        if (self.latest - self.earliest).total_seconds() < self.duration_minutes * 60:
+            raise ValueError("The window is shorter than the requested duration")
+        return self
+
+class WaitlistEntry(BaseModel):
+    entry_id: uuid.UUID
+    clinic_id: uuid.UUID
+    provider_id: uuid.UUID | None = None
+    patient_id: uuid.UUID
+    earliest: datetime
+    latest: datetime
+    duration_minutes: int
+    priority: int
+    status: str
+    offered_room_id: uuid.UUID | None = None
+    offered_provider_id: uuid.UUID | None = None
+    offered_start: datetime | None = None
+    offered_end: datetime | None = None
+    offer_expires_at: datetime | None = None
+    appt_id: uuid.UUID | None = None
+    created_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
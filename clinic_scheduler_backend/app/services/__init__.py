@@ -0,0 +1 @@
+# Business logic shared by the routers (booking rules, scheduling engines)
@@ -0,0 +1,124 @@
+import gzip
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..utils.fastjson import dumps
+
+# Closed appointments older than this (by end_time) leave the hot table
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", 180))
+# Appointments moved per transaction
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 2000))
+
+# Statuses that can never change again, so the rows are safe to move
+CLOSED_STATUSES = (models.StatusEnum.completed, models.StatusEnum.cancelled, models.StatusEnum.no_show)
+
+
+def archive_horizon(db: Session) -> datetime | None:
+    """
+    Latest start_time in the archive (an index lookup), or None when it is
+    empty. Ranges starting after it never need the archive.
+    """
+    return db.execute(select(func.max(models.AppointmentArchive.start_time))).scalar()
+
+
+def needs_archive(horizon: datetime | None, date_from: datetime | None) -> bool:
+    return horizon is not None and (date_from is None or date_from <= horizon)
+
+
+def appointment_sources(db: Session, date_from: datetime | None = None) -> tuple:
+    """The models a read starting at date_from has to cover: hot, plus archive if needed."""
+    if needs_archive(archive_horizon(db), date_from):
+        return models.Appointment, models.AppointmentArchive
+    return (models.Appointment,)
+
+
+def month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def ensure_partitions(db: Session, months):
+    """Create the archive's monthly partitions (PostgreSQL only; no-op elsewhere)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for first in sorted(set(months)):
+        following = date(first.year + first.month // 12, first.month % 12 + 1, 1)
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS appointments_archive_y{first.year}m{first.month:02d} "
+            f"PARTITION OF appointments_archive FOR VALUES FROM ('{first}') TO ('{following}')"
+        ))
+
+
+def archive_batch(db: Session, cutoff: datetime, limit: int = ARCHIVE_BATCH_SIZE) -> list[dict]:
+    """
+    Move up to `limit` closed appointments that ended before cutoff from
+    appointments to appointments_archive, oldest first, and drop their
+    finished reminder jobs. Returns the moved rows. The caller commits, so
+    the copy and the delete are one transaction.
+    """
+    Appointment = models.Appointment
+    rows = db.execute(
+        select(Appointment.__table__)
+        .where(Appointment.status.in_(CLOSED_STATUSES), Appointment.end_time < cutoff)
+        .order_by(Appointment.start_time)
+        .limit(limit)
+    ).mappings().all()
+    if not rows:
+        return []
+
+    ensure_partitions(db, (month_start(row["start_time"]) for row in rows))
+    ids = [row["appt_id"] for row in rows]
+    db.execute(insert(models.AppointmentArchive), [dict(row) for row in rows])
+    db.execute(delete(models.ReminderOutbox).where(models.ReminderOutbox.appt_id.in_(ids)))
+    db.execute(delete(Appointment).where(Appointment.appt_id.in_(ids)))
+    return [dict(row) for row in rows]
+
+
+class NdjsonArchiveWriter:
+    """
+    Cold copy of archived rows as gzip-compressed NDJSON, one file per
+    month of start_time (appointments-YYYY-MM.ndjson.gz). Each call appends
+    a new gzip member, which gzip readers treat as one continuous stream.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, month: date) -> Path:
+        return self.directory / f"appointments-{month:%Y-%m}.ndjson.gz"
+
+    def write(self, rows: list[dict]):
+        by_month = defaultdict(list)
+        for row in rows:
+            by_month[month_start(row["start_time"])].append(dumps(row))
+        for month, lines in by_month.items():
+            with gzip.open(self.path(month), "ab") as file:
+                file.write(b"\n".join(lines) + b"\n")
+
+
+def archive_closed(
+    session_factory, cutoff: datetime | None = None, writer: NdjsonArchiveWriter | None = None,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> int:
+    """
+    Archive every eligible appointment in batches, one short transaction
+    each so bookings are never blocked for long. Rows reach the writer
+    only after their batch commits. Returns the number moved.
+    """
+    cutoff = cutoff or datetime.utcnow() - timedelta(days=ARCHIVE_AFTER_DAYS)
+    moved = 0
+    while True:
+        with session_factory() as db:
+            rows = archive_batch(db, cutoff, batch_size)
+            db.commit()
+        if not rows:
+            return moved
+        if writer is not None:
+            writer.write(rows)
+        moved += len(rows)
@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .. import models
+from .conflicts import overlap_clause
+
+
+class Slot(NamedTuple):
+    start_time: datetime
+    end_time: datetime
+    room_id: UUID
+    provider_id: UUID
+
+
+def merge_intervals(intervals: list[tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+    """
+    Sort-and-sweep merge of busy intervals. Overlapping or touching
+    intervals collapse into one, leaving a sorted, disjoint list.
+    """
+    merged: list[tuple[datetime, datetime]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class _Cursor:
+    """Forward-only pointer into one resource's merged busy list."""
+
+    __slots__ = ("busy", "index")
+
+    def __init__(self, busy: list[tuple[datetime, datetime]]):
+        self.busy = busy
+        self.index = 0
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        busy = self.busy
+        # Candidate starts only move forward, so intervals that ended before
+        # this one can be skipped for good.
+        while self.index < len(busy) and busy[self.index][1] <= start:
+            self.index += 1
+        return self.index == len(busy) or busy[self.index][0] >= end
+
+
+def load_busy_intervals(
+    db: Session,
+    clinic_id: UUID,
+    start_time: datetime,
+    end_time: datetime,
+    room_id: UUID | None = None,
+    provider_id: UUID | None = None,
+) -> tuple[dict[UUID, list], dict[UUID, list]]:
+    """
+    Load the clinic's rooms, providers and every active appointment in the
+    window once, and return merged busy intervals keyed by room and provider.
+    """
+    Appointment = models.Appointment
+
+    room_query = select(models.Room.id).where(models.Room.clinic_id == clinic_id)
+    if room_id is not None:
+        room_query = room_query.where(models.Room.id == room_id)
+    provider_query = select(models.Provider.id).where(models.Provider.clinic_id == clinic_id)
+    if provider_id is not None:
+        provider_query = provider_query.where(models.Provider.id == provider_id)
+
+    rooms_busy: dict[UUID, list] = {rid: [] for rid in db.execute(room_query).scalars()}
+    providers_busy: dict[UUID, list] = {pid: [] for pid in db.execute(provider_query).scalars()}
+
+    rows = db.execute(
+        select(
+            Appointment.room_id, Appointment.provider_id,
+            Appointment.start_time, Appointment.end_time,
+        ).where(
+            Appointment.clinic_id == clinic_id,
+            overlap_clause(start_time, end_time),
+        )
+    )
+    for appt_room, appt_provider, appt_start, appt_end in rows:
+        if appt_room in rooms_busy:
+            rooms_busy[appt_room].append((appt_start, appt_end))
+        if appt_provider in providers_busy:
+            providers_busy[appt_provider].append((appt_start, appt_end))
+
+    return (
+        {rid: merge_intervals(busy) for rid, busy in rooms_busy.items()},
+        {pid: merge_intervals(busy) for pid, busy in providers_busy.items()},
+    )
+
+
+def find_open_slots(
+    rooms_busy: dict[UUID, list],
+    providers_busy: dict[UUID, list],
+    start_time: datetime,
+    end_time: datetime,
+    duration: timedelta,
+    step: timedelta,
+    limit: int,
+) -> list[Slot]:
+    """
+    Walk candidate start times on a fixed grid and pair each bookable slot
+    with the first free room and the first free provider. Every resource
+    keeps a forward-only cursor, so the whole search is a single pass over
+    the merged busy lists.
+    """
+    room_cursors = [(rid, _Cursor(busy)) for rid, busy in rooms_busy.items()]
+    provider_cursors = [(pid, _Cursor(busy)) for pid, busy in providers_busy.items()]
+    if not room_cursors or not provider_cursors:
+        return []
+
+    slots: list[Slot] = []
+    slot_start = start_time
+    while slot_start + duration <= end_time and len(slots) < limit:
+        slot_end = slot_start + duration
+        room = next((rid for rid, cur in room_cursors if cur.is_free(slot_start, slot_end)), None)
+        if room is not None:
+            provider = next(
+                (pid for pid, cur in provider_cursors if cur.is_free(slot_start, slot_end)), None
+            )
+            if provider is not None:
+                slots.append(Slot(slot_start, slot_end, room, provider))
+        slot_start += step
+    return slots
+
+
+def search_availability(
+    db: Session,
+    clinic_id: UUID,
+    start_time: datetime,
+    end_time: datetime,
+    duration: timedelta,
+    step: timedelta,
+    limit: int,
+    room_id: UUID | None = None,
+    provider_id: UUID | None = None,
+) -> list[Slot]:
+    rooms_busy, providers_busy = load_busy_intervals(
+        db, clinic_id, start_time, end_time, room_id=room_id, provider_id=provider_id
+    )
+    return find_open_slots(rooms_busy, providers_busy, start_time, end_time, duration, step, limit)
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import random
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..database import WRITE_LOCK
+from .conflicts import find_conflicts
+from .rollups import apply_rollup
+
+# SQLite: attempts at taking the write lock before giving up. Each attempt
+# already waits up to SQLITE_BUSY_TIMEOUT_MS inside the driver.
+BOOKING_RETRIES = int(os.getenv("BOOKING_RETRIES", 5))
+BOOKING_BACKOFF_SECONDS = float(os.getenv("BOOKING_BACKOFF_SECONDS", 0.05))
+
+# PostgreSQL exclusion constraints (alembic revisions 0002 and 0008) and the resource
+# each one protects
+EXCLUSION_CONSTRAINTS = {
+    "ex_appointments_room_time": "room",
+    "ex_appointments_provider_time": "provider",
+}
+
+
+class BookingConflict(Exception):
+    def __init__(self, resources: list[str]):
+        super().__init__(", ".join(resources))
+        self.resources = resources
+
+
+def exclusion_resource(exc: IntegrityError) -> str | None:
+    """The resource whose exclusion constraint rejected the write, if any."""
+    message = str(exc.orig)
+    for constraint, resource in EXCLUSION_CONSTRAINTS.items():
+        if constraint in message:
+            return resource
+    return None
+
+
+def is_lock_timeout(exc: OperationalError) -> bool:
+    message = str(exc.orig).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+async def with_write_lock(db: AsyncSession, work):
+    """
+    Run `await work()` in a write transaction and commit it.
+
+    SQLite starts the transaction with BEGIN IMMEDIATE, so the conflict check
+    and the insert run under the single writer lock and cannot interleave
+    with another booking; lock timeouts are retried with jittered
+    exponential backoff. On PostgreSQL the transaction is an ordinary one
+    and the exclusion constraints reject a racing overlap, which is surfaced
+    as BookingConflict. They are DEFERRABLE INITIALLY IMMEDIATE (revision
+    0008), so they normally fire at the INSERT/UPDATE inside work() (on
+    flush), and only at commit where work() defers them (a series move).
+    Both points are covered here.
+    """
+    for attempt in range(BOOKING_RETRIES + 1):
+        try:
+            await db.connection(execution_options=WRITE_LOCK)
+            result = await work()
+            await db.commit()
+            return result
+        except IntegrityError as e:
+            await db.rollback()
+            resource = exclusion_resource(e)
+            if resource:
+                raise BookingConflict([resource])
+            raise
+        except OperationalError as e:
+            await db.rollback()
+            if not is_lock_timeout(e) or attempt == BOOKING_RETRIES:
+                raise
+            await asyncio.sleep(BOOKING_BACKOFF_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5))
+        except BaseException:
+            await db.rollback()
+            raise
+
+
+async def insert_appointment(db: AsyncSession, values: dict) -> models.Appointment:
+    """
+    Conflict check plus insert (and rollup update) for use inside a
+    with_write_lock unit of work. Raises BookingConflict.
+    """
+    # Room, provider and patient double-booking checks in one round trip
+    conflicts = await db.run_sync(
+        find_conflicts,
+        room_id=values["room_id"],
+        provider_id=values["provider_id"],
+        patient_id=values["patient_id"],
+        start_time=values["start_time"],
+        end_time=values["end_time"],
+    )
+    if conflicts:
+        raise BookingConflict(sorted({c.resource for c in conflicts}))
+
+    appointment = models.Appointment(**values)
+    db.add(appointment)
+    await db.flush()
+    await db.run_sync(apply_rollup, (), [values])
+    return appointment
+
+
+async def book_appointment(db: AsyncSession, values: dict) -> models.Appointment:
+    """Check for conflicts and insert the appointment as one atomic step."""
+    return await with_write_lock(db, lambda: insert_appointment(db, values))
@@ -0,0 +1,210 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import NamedTuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import and_, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from .. import models
+
+# Longest appointment we accept. Bounding the duration lets the overlap
+# predicate also bound start_time from below, so each check is a short range
+# scan on the (resource_id, start_time, end_time) indexes instead of a walk
+# over the resource's whole booking history.
+MAX_APPOINTMENT_DURATION = timedelta(hours=12)
+
+# Statuses that no longer hold a room, provider or patient
+INACTIVE_STATUSES = (models.StatusEnum.cancelled,)
+
+
+class Conflict(NamedTuple):
+    resource: str  # "room", "provider" or "patient"
+    appt_id: UUID
+
+
+def overlap_clause(start_time: datetime, end_time: datetime):
+    """
+    Half-open interval overlap: [start, end) intersects [new_start, new_end).
+    Back-to-back appointments (one ends when the next starts) do not clash.
+    """
+    Appointment = models.Appointment
+    return and_(
+        Appointment.start_time < end_time,
+        Appointment.end_time > start_time,
+        Appointment.start_time > start_time - MAX_APPOINTMENT_DURATION,
+        Appointment.status.not_in(INACTIVE_STATUSES),
+    )
+
+
+def find_conflicts(
+    db: Session,
+    room_id: UUID,
+    provider_id: UUID,
+    patient_id: UUID,
+    start_time: datetime,
+    end_time: datetime,
+    exclude_appt_id: UUID | None = None,
+) -> list[Conflict]:
+    """
+    Return every active appointment that would clash with the given booking
+    on its room, provider or patient. The three checks run as one UNION ALL
+    statement (a single round trip), each branch driven by its own index.
+    """
+    Appointment = models.Appointment
+    branches = []
+    for resource, column, value in (
+        ("room", Appointment.room_id, room_id),
+        ("provider", Appointment.provider_id, provider_id),
+        ("patient", Appointment.patient_id, patient_id),
+    ):
+        branch = select(literal(resource).label("resource"), Appointment.appt_id).where(
+            column == value, overlap_clause(start_time, end_time)
+        )
+        if exclude_appt_id is not None:
+            branch = branch.where(Appointment.appt_id != exclude_appt_id)
+        branches.append(branch)
+
+    rows = db.execute(union_all(*branches)).all()
+    return [Conflict(row.resource, row.appt_id) for row in rows]
+
+
+class Timeline:
+    """
+    Sorted intervals held by one room, provider or patient. Each interval
+    records its source: the position of the batch item that claimed it, or
+    STORED for an appointment already in the database.
+    """
+
+    STORED = -1
+
+    __slots__ = ("intervals",)
+
+    def __init__(self):
+        self.intervals: list[tuple[datetime, datetime, int]] = []
+
+    def add(self, start_time: datetime, end_time: datetime, source: int = STORED):
+        insort(self.intervals, (start_time, end_time, source))
+
+    def clash(self, start_time: datetime, end_time: datetime) -> int | None:
+        """Source of the first interval overlapping [start, end), or None."""
+        intervals = self.intervals
+        lo = bisect_right(intervals, (start_time - MAX_APPOINTMENT_DURATION, datetime.max))
+        hi = bisect_left(intervals, (end_time,))
+        for _, other_end, source in intervals[lo:hi]:
+            if other_end > start_time:
+                return source
+        return None
+
+
+class BatchDecision(NamedTuple):
+    index: int
+    status: str  # "created", "conflict" or "invalid"
+    appt_id: UUID | None = None
+    detail: str | None = None
+
+
+def load_timelines(
+    db: Session,
+    items: list,
+    start_time: datetime,
+    end_time: datetime,
+    exclude_appt_ids=(),
+) -> dict:
+    """
+    Fetch every active appointment in [start_time, end_time) that shares a
+    room, provider or patient with the batch, in one UNION ALL query, and
+    index it by (resource, id). Appointments in exclude_appt_ids are left
+    out, so rows being moved do not clash with their own old slots.
+    """
+    Appointment = models.Appointment
+    branches = []
+    for resource, column in (
+        ("room", Appointment.room_id),
+        ("provider", Appointment.provider_id),
+        ("patient", Appointment.patient_id),
+    ):
+        keys = {getattr(item, f"{resource}_id") for item in items}
+        branch = select(
+            literal(resource).label("resource"), column.label("key"),
+            Appointment.start_time, Appointment.end_time,
+        ).where(column.in_(keys), overlap_clause(start_time, end_time))
+        if exclude_appt_ids:
+            branch = branch.where(Appointment.appt_id.not_in(exclude_appt_ids))
+        branches.append(branch)
+
+    timelines: dict[tuple[str, UUID], Timeline] = {}
+    for row in db.execute(union_all(*branches)):
+        timelines.setdefault((row.resource, row.key), Timeline()).add(row.start_time, row.end_time)
+    return timelines
+
+
+def resolve_batch(
+    db: Session, items: list, exclude_appt_ids=()
+) -> tuple[list[BatchDecision], list[dict]]:
+    """
+    Decide every item of a booking batch against the database and against
+    the other items in a single pass. Returns one decision per item (in the
+    original order) and the rows to insert for the accepted ones.
+    """
+    decisions: dict[int, BatchDecision] = {}
+    valid = []
+    for index, item in enumerate(items):
+        if item.end_time <= item.start_time:
+            decisions[index] = BatchDecision(index, "invalid", detail="End time must be after start time")
+        elif item.end_time - item.start_time > MAX_APPOINTMENT_DURATION:
+            decisions[index] = BatchDecision(
+                index, "invalid", detail="Appointment is longer than the maximum allowed duration"
+            )
+        else:
+            valid.append((index, item))
+
+    rows: list[dict] = []
+    if valid:
+        timelines = load_timelines(
+            db,
+            [item for _, item in valid],
+            min(item.start_time for _, item in valid),
+            max(item.end_time for _, item in valid),
+            exclude_appt_ids,
+        )
+
+        # Earlier slots win when batch items contend for the same resource
+        valid.sort(key=lambda pair: (pair[1].start_time, pair[0]))
+        for index, item in valid:
+            clashes = {}
+            for resource in ("room", "provider", "patient"):
+                timeline = timelines.get((resource, getattr(item, f"{resource}_id")))
+                if timeline is not None:
+                    source = timeline.clash(item.start_time, item.end_time)
+                    if source is not None:
+                        clashes[resource] = source
+
+            if clashes:
+                resources = ", ".join(sorted(clashes))
+                batch_sources = sorted(s for s in clashes.values() if s != Timeline.STORED)
+                if batch_sources:
+                    detail = f"Time slot conflicts with item {batch_sources[0]} in this batch ({resources})"
+                else:
+                    detail = f"Time slot conflicts with existing appointment ({resources})"
+                decisions[index] = BatchDecision(index, "conflict", detail=detail)
+                continue
+
+            for resource in ("room", "provider", "patient"):
+                timelines.setdefault(
+                    (resource, getattr(item, f"{resource}_id")), Timeline()
+                ).add(item.start_time, item.end_time, index)
+
+            row = item.dict()
+            row["appt_id"] = uuid4()
+            row["status"] = models.StatusEnum.booked
+            rows.append(row)
+            decisions[index] = BatchDecision(index, "created", appt_id=row["appt_id"])
+
+    return [decisions[index] for index in range(len(items))], rows
+
+
+def insert_appointments(db: Session, rows: list[dict]):
+    """Insert accepted rows with one multi-row INSERT; the caller commits."""
+    if rows:
+        db.execute(insert(models.Appointment), rows)
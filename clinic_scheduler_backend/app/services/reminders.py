@@ -0,0 +1,320 @@
+import asyncio
+import importlib
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import exists, insert, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import AsyncSessionLocal
+from .booking import with_write_lock
+from .series import ACTIVE_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_leads(spec: str) -> list[tuple[str, timedelta]]:
+    return [(f"{hours}h", timedelta(hours=int(hours))) for hours in spec.split(",") if hours.strip()]
+
+
+# How long before the appointment each reminder goes out, in hours
+REMINDER_LEADS = _parse_leads(os.getenv("REMINDER_LEADS_HOURS", "24,2"))
+# How far past "due now" each scan schedules jobs, and how late a job may
+# still be created (after downtime) before that lead is skipped
+REMINDER_SCAN_AHEAD = timedelta(minutes=int(os.getenv("REMINDER_SCAN_AHEAD_MINUTES", 30)))
+REMINDER_GRACE = timedelta(minutes=int(os.getenv("REMINDER_GRACE_MINUTES", 15)))
+
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", 500))
+REMINDER_CONCURRENCY = int(os.getenv("REMINDER_CONCURRENCY", 50))
+REMINDER_SEND_TIMEOUT_SECONDS = float(os.getenv("REMINDER_SEND_TIMEOUT_SECONDS", 10))
+REMINDER_MAX_ATTEMPTS = int(os.getenv("REMINDER_MAX_ATTEMPTS", 5))
+REMINDER_RETRY_SECONDS = int(os.getenv("REMINDER_RETRY_SECONDS", 60))
+# A claimed job not reported back within the lease is claimed again
+REMINDER_LEASE_SECONDS = int(os.getenv("REMINDER_LEASE_SECONDS", 300))
+REMINDER_POLL_SECONDS = float(os.getenv("REMINDER_POLL_SECONDS", 5))
+REMINDER_SCAN_SECONDS = float(os.getenv("REMINDER_SCAN_SECONDS", 60))
+
+# Process-wide counters, exported on /metrics
+reminder_stats = {"scheduled": 0, "sent": 0, "retried": 0, "failed": 0, "skipped": 0}
+
+
+class Reminder(NamedTuple):
+    outbox_id: int
+    appt_id: object
+    kind: str
+    channel: str
+    attempts: int
+    start_time: datetime
+    patient_name: str
+    patient_phone: str | None
+    patient_email: str
+    clinic_name: str
+    provider_name: str
+
+
+def render_message(reminder: Reminder) -> str:
+    when = reminder.start_time.strftime("%a %d %b %Y at %H:%M")
+    return (
+        f"Hi {reminder.patient_name}, this is a reminder of your appointment with "
+        f"{reminder.provider_name} at {reminder.clinic_name} on {when} (UTC)."
+    )
+
+
+# ==========================================================
+# SENDERS
+# ==========================================================
+class ReminderSender(ABC):
+    """
+    Delivers one reminder. Raise to signal failure; the dispatcher retries
+    with backoff. Implementations must be safe to call concurrently.
+    """
+
+    @abstractmethod
+    async def send(self, reminder: Reminder) -> None:
+        ...
+
+
+class LogSender(ReminderSender):
+    """Writes each reminder to the application log."""
+
+    async def send(self, reminder: Reminder) -> None:
+        logger.info("Reminder %s to %s: %s", reminder.kind, reminder.patient_phone or reminder.patient_email,
+                    render_message(reminder))
+
+
+class FileSender(ReminderSender):
+    """Appends each reminder as one JSON line to a local file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _append(self, line: str):
+        with self._lock, open(self.path, "a", encoding="utf-8") as out:
+            out.write(line + "\n")
+
+    async def send(self, reminder: Reminder) -> None:
+        line = json.dumps({
+            "appt_id": str(reminder.appt_id),
+            "kind": reminder.kind,
+            "channel": reminder.channel,
+            "to": reminder.patient_phone or reminder.patient_email,
+            "message": render_message(reminder),
+        })
+        await asyncio.to_thread(self._append, line)
+
+
+def load_sender(spec: str) -> ReminderSender:
+    """
+    Build a sender from REMINDER_SENDER: "log", "file:/path/to/out.ndjson",
+    or "package.module:ClassName" for a custom ReminderSender.
+    """
+    if spec == "log":
+        return LogSender()
+    if spec.startswith("file:"):
+        return FileSender(spec[len("file:"):])
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+# ==========================================================
+# OUTBOX
+# ==========================================================
+def schedule_reminders(db: Session, now: datetime) -> int:
+    """
+    Write outbox jobs for reminders falling due in the next scan window.
+    Appointments are found with a range scan on (status, start_time); jobs
+    that already exist are skipped, so overlapping scans are harmless.
+    The caller commits.
+    """
+    Appointment, Outbox = models.Appointment, models.ReminderOutbox
+    scheduled = 0
+    for kind, lead in REMINDER_LEADS:
+        candidates = db.execute(
+            select(Appointment.appt_id, Appointment.start_time).where(
+                Appointment.status.in_(ACTIVE_STATUSES),
+                Appointment.start_time >= max(now, now + lead - REMINDER_GRACE),
+                Appointment.start_time < now + lead + REMINDER_SCAN_AHEAD,
+                ~exists().where(Outbox.appt_id == Appointment.appt_id, Outbox.kind == kind),
+            )
+        ).all()
+        if candidates:
+            db.execute(insert(Outbox), [
+                {
+                    "appt_id": appt_id,
+                    "kind": kind,
+                    "channel": "sms",
+                    "send_at": start_time - lead,
+                    "next_attempt_at": start_time - lead,
+                    "status": "pending",
+                    "attempts": 0,
+                }
+                for appt_id, start_time in candidates
+            ])
+            scheduled += len(candidates)
+    return scheduled
+
+
+def claim_batch(db: Session, now: datetime, batch_size: int) -> list[Reminder]:
+    """
+    Claim up to batch_size due jobs: mark them "sending" with a lease and
+    count the attempt, all in the caller's transaction. Jobs whose
+    appointment is no longer active are marked "skipped" instead. On
+    PostgreSQL, concurrent dispatchers skip each other's locked rows.
+    """
+    Outbox, Appointment = models.ReminderOutbox, models.Appointment
+    query = (
+        select(
+            Outbox.id, Outbox.appt_id, Outbox.kind, Outbox.channel, Outbox.attempts,
+            Appointment.start_time, Appointment.status.label("appt_status"),
+            models.User.name.label("patient_name"), models.User.phone.label("patient_phone"),
+            models.User.email.label("patient_email"), models.Clinic.name.label("clinic_name"),
+            models.Provider.name.label("provider_name"),
+        )
+        .join(Appointment, Appointment.appt_id == Outbox.appt_id)
+        .join(models.User, models.User.id == Appointment.patient_id)
+        .join(models.Clinic, models.Clinic.id == Appointment.clinic_id)
+        .join(models.Provider, models.Provider.id == Appointment.provider_id)
+        .where(Outbox.status.in_(("pending", "sending")), Outbox.next_attempt_at <= now)
+        .order_by(Outbox.next_attempt_at)
+        .limit(batch_size)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True, of=Outbox)
+
+    claimed, skipped = [], []
+    for row in db.execute(query):
+        if row.appt_status not in ACTIVE_STATUSES or row.start_time <= now:
+            skipped.append(row.id)
+            continue
+        claimed.append(Reminder(
+            outbox_id=row.id,
+            appt_id=row.appt_id,
+            kind=row.kind,
+            channel=row.channel,
+            attempts=row.attempts + 1,
+            start_time=row.start_time,
+            patient_name=row.patient_name,
+            patient_phone=row.patient_phone,
+            patient_email=row.patient_email,
+            clinic_name=row.clinic_name,
+            provider_name=row.provider_name,
+        ))
+
+    if claimed:
+        db.execute(
+            update(Outbox)
+            .where(Outbox.id.in_([r.outbox_id for r in claimed]))
+            .values(
+                status="sending",
+                attempts=Outbox.attempts + 1,
+                next_attempt_at=now + timedelta(seconds=REMINDER_LEASE_SECONDS),
+            )
+        )
+    if skipped:
+        db.execute(update(Outbox).where(Outbox.id.in_(skipped)).values(status="skipped"))
+        reminder_stats["skipped"] += len(skipped)
+    return claimed
+
+
+def record_results(db: Session, now: datetime, sent: list[int], failures: list[tuple[Reminder, str]]):
+    """Mark delivered jobs sent (one UPDATE) and reschedule or fail the rest."""
+    Outbox = models.ReminderOutbox
+    if sent:
+        db.execute(update(Outbox).where(Outbox.id.in_(sent)).values(status="sent", sent_at=now))
+    if failures:
+        db.execute(update(Outbox), [
+            {
+                "id": reminder.outbox_id,
+                "status": "failed" if reminder.attempts >= REMINDER_MAX_ATTEMPTS else "pending",
+                "next_attempt_at": now + timedelta(seconds=REMINDER_RETRY_SECONDS * 2 ** (reminder.attempts - 1)),
+                "last_error": error[:500],
+            }
+            for reminder, error in failures
+        ])
+
+
+# ==========================================================
+# DISPATCHER
+# ==========================================================
+class ReminderDispatcher:
+    """
+    Scans for upcoming appointments and drains the outbox in batches,
+    sending up to `concurrency` reminders at a time. Runs outside the
+    request path: as its own process (reminder_worker.py) or as a
+    background task of the API when REMINDER_WORKER is enabled.
+    """
+
+    def __init__(
+        self,
+        sender: ReminderSender,
+        session_factory=AsyncSessionLocal,
+        batch_size: int = REMINDER_BATCH_SIZE,
+        concurrency: int = REMINDER_CONCURRENCY,
+    ):
+        self.sender = sender
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def schedule(self, now: datetime | None = None) -> int:
+        now = now or datetime.utcnow()
+        async with self.session_factory() as db:
+            scheduled = await with_write_lock(db, lambda: db.run_sync(schedule_reminders, now))
+        reminder_stats["scheduled"] += scheduled
+        return scheduled
+
+    async def _send(self, reminder: Reminder) -> str | None:
+        async with self._semaphore:
+            try:
+                await asyncio.wait_for(self.sender.send(reminder), REMINDER_SEND_TIMEOUT_SECONDS)
+                return None
+            except Exception as e:
+                return f"{type(e).__name__}: {e}"
+
+    async def dispatch_once(self, now: datetime | None = None) -> int:
+        """Claim, send and record one batch. Returns the number claimed."""
+        now = now or datetime.utcnow()
+        async with self.session_factory() as db:
+            batch = await with_write_lock(db, lambda: db.run_sync(claim_batch, now, self.batch_size))
+            if not batch:
+                return 0
+
+            errors = await asyncio.gather(*(self._send(reminder) for reminder in batch))
+            sent = [reminder.outbox_id for reminder, error in zip(batch, errors) if error is None]
+            failures = [(reminder, error) for reminder, error in zip(batch, errors) if error is not None]
+
+            finished = datetime.utcnow()
+            await with_write_lock(db, lambda: db.run_sync(record_results, finished, sent, failures))
+
+        reminder_stats["sent"] += len(sent)
+        for reminder, error in failures:
+            final = reminder.attempts >= REMINDER_MAX_ATTEMPTS
+            reminder_stats["failed" if final else "retried"] += 1
+            logger.warning("Reminder %s for %s failed (attempt %s): %s",
+                           reminder.kind, reminder.appt_id, reminder.attempts, error)
+        return len(batch)
+
+    async def run(self, stop: asyncio.Event):
+        """Scan every REMINDER_SCAN_SECONDS; drain full batches back to back."""
+        next_scan = 0.0
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            try:
+                if loop.time() >= next_scan:
+                    await self.schedule()
+                    next_scan = loop.time() + REMINDER_SCAN_SECONDS
+                while not stop.is_set() and await self.dispatch_once() == self.batch_size:
+                    pass
+            except Exception:
+                logger.exception("Reminder dispatcher iteration failed")
+            try:
+                await asyncio.wait_for(stop.wait(), REMINDER_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,157 @@
+import enum
+from collections import defaultdict
+from datetime import date, datetime, time
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .. import models
+from .archive import appointment_sources
+
+# Appointments read per round trip during a rebuild
+REBUILD_CHUNK_SIZE = 5000
+
+# Rollup grain; also the conflict target of the upsert
+KEY_COLUMNS = ("clinic_id", "day", "room_id", "provider_id", "status")
+
+
+def _status(value) -> str:
+    return value.value if isinstance(value, enum.Enum) else str(value or models.StatusEnum.booked.value)
+
+
+def rollup_key(appointment: dict) -> tuple:
+    return (
+        appointment["clinic_id"],
+        appointment["start_time"].date(),
+        appointment["room_id"],
+        appointment["provider_id"],
+        _status(appointment.get("status")),
+    )
+
+
+def booked_minutes(appointment: dict) -> int:
+    return int((appointment["end_time"] - appointment["start_time"]).total_seconds() // 60)
+
+
+def accumulate(deltas: dict, appointments, sign: int):
+    for appointment in appointments:
+        count, minutes = deltas[rollup_key(appointment)]
+        deltas[rollup_key(appointment)] = (count + sign, minutes + sign * booked_minutes(appointment))
+
+
+def _upsert(db: Session):
+    table = models.UtilizationDaily.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(table)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(table)
+    else:
+        raise NotImplementedError(f"No rollup upsert for {dialect}")
+    return stmt.on_conflict_do_update(
+        index_elements=list(KEY_COLUMNS),
+        set_={
+            "appointments": table.c.appointments + stmt.excluded.appointments,
+            "booked_minutes": table.c.booked_minutes + stmt.excluded.booked_minutes,
+        },
+    )
+
+
+def apply_rollup(db: Session, removed=(), added=()):
+    """
+    Move appointments out of / into the daily rollup inside the caller's
+    transaction. Each argument is an iterable of dicts with the appointment
+    columns (clinic_id, room_id, provider_id, status, start_time,
+    end_time). A status change is the old state removed plus the new one
+    added. All deltas go out as one executemany upsert.
+    """
+    deltas: dict[tuple, tuple[int, int]] = defaultdict(lambda: (0, 0))
+    accumulate(deltas, removed, -1)
+    accumulate(deltas, added, 1)
+    rows = [
+        {**dict(zip(KEY_COLUMNS, key)), "appointments": count, "booked_minutes": minutes}
+        for key, (count, minutes) in deltas.items()
+        if count or minutes
+    ]
+    if rows:
+        db.execute(_upsert(db), rows)
+
+
+def rebuild_rollup(db: Session, date_from: date | None = None, date_to: date | None = None) -> int:
+    """
+    Recompute the rollup from the appointments (and, where the range needs
+    it, archive) tables for [date_from, date_to) (everything when omitted),
+    streaming appointments in chunks.
+    Returns the number of rollup rows written. The caller commits.
+    """
+    Rollup = models.UtilizationDaily
+    start = datetime.combine(date_from, time.min) if date_from is not None else None
+    clear = delete(Rollup)
+    if date_from is not None:
+        clear = clear.where(Rollup.day >= date_from)
+    if date_to is not None:
+        clear = clear.where(Rollup.day < date_to)
+
+    # Archived appointments still count towards their days
+    queries = []
+    for Appointment in appointment_sources(db, start):
+        query = select(
+            Appointment.clinic_id, Appointment.room_id, Appointment.provider_id,
+            Appointment.status, Appointment.start_time, Appointment.end_time,
+        )
+        if date_from is not None:
+            query = query.where(Appointment.start_time >= start)
+        if date_to is not None:
+            query = query.where(Appointment.start_time < datetime.combine(date_to, time.min))
+        queries.append(query)
+
+    deltas: dict[tuple, tuple[int, int]] = defaultdict(lambda: (0, 0))
+    result = db.execute(union_all(*queries).execution_options(yield_per=REBUILD_CHUNK_SIZE))
+    for chunk in result.mappings().partitions():
+        accumulate(deltas, chunk, 1)
+
+    db.execute(clear)
+    rows = [
+        {**dict(zip(KEY_COLUMNS, key)), "appointments": count, "booked_minutes": minutes}
+        for key, (count, minutes) in deltas.items()
+    ]
+    if rows:
+        db.execute(insert(Rollup), rows)
+    return len(rows)
+
+
+def utilization_report(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    group_by: tuple[str, ...],
+    clinic_id: UUID | None = None,
+    room_id: UUID | None = None,
+    provider_id: UUID | None = None,
+    statuses: tuple[str, ...] | None = None,
+) -> list[dict]:
+    """SUM of the rollup over [date_from, date_to), grouped by the given dimensions."""
+    Rollup = models.UtilizationDaily
+    dimensions = [getattr(Rollup, column) for column in group_by]
+    query = (
+        select(
+            *dimensions,
+            func.sum(Rollup.appointments).label("appointments"),
+            func.sum(Rollup.booked_minutes).label("booked_minutes"),
+        )
+        .where(Rollup.day >= date_from, Rollup.day < date_to)
+        .group_by(*dimensions)
+        .order_by(*dimensions)
+    )
+    if clinic_id is not None:
+        query = query.where(Rollup.clinic_id == clinic_id)
+    if room_id is not None:
+        query = query.where(Rollup.room_id == room_id)
+    if provider_id is not None:
+        query = query.where(Rollup.provider_id == provider_id)
+    if statuses is not None:
+        query = query.where(Rollup.status.in_(statuses))
+
+    return [dict(row) for row in db.execute(query).mappings() if row["appointments"]]
@@ -0,0 +1,237 @@
+import calendar
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+from .booking import EXCLUSION_CONSTRAINTS
+from .conflicts import BatchDecision, insert_appointments, resolve_batch
+from .rollups import apply_rollup
+
+# Most occurrences a single series may expand to
+MAX_SERIES_OCCURRENCES = 200
+
+# Occurrences that a cancel or move still applies to
+ACTIVE_STATUSES = (models.StatusEnum.booked, models.StatusEnum.confirmed)
+
+
+class SeriesConflict(Exception):
+    """Raised inside the booking transaction so nothing is written."""
+
+    def __init__(self, decisions: list[BatchDecision]):
+        super().__init__("Series occurrences conflict")
+        self.decisions = decisions
+
+
+def add_months(value: datetime, months: int) -> datetime | None:
+    """value shifted by whole months, or None when that day does not exist."""
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    if value.day > calendar.monthrange(year, month)[1]:
+        return None
+    return value.replace(year=year, month=month)
+
+
+def expand_occurrences(
+    start_time: datetime,
+    end_time: datetime,
+    frequency: str,
+    interval: int = 1,
+    count: int | None = None,
+    until: datetime | None = None,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Occurrence (start, end) pairs for an RRULE-style rule. As in RFC 5545,
+    until is inclusive and monthly dates that do not exist (the 31st in a
+    30-day month) are skipped rather than moved. Raises ValueError when the
+    rule produces nothing or more than MAX_SERIES_OCCURRENCES.
+    """
+    duration = end_time - start_time
+    occurrences = []
+    # Monthly rules can skip periods, so bound the walk by periods too
+    for period in range(MAX_SERIES_OCCURRENCES * 12):
+        if frequency == "monthly":
+            start = add_months(start_time, period * interval)
+            if start is None:
+                continue
+        else:
+            days = 7 if frequency == "weekly" else 1
+            start = start_time + timedelta(days=period * interval * days)
+
+        if until is not None and start > until:
+            break
+        occurrences.append((start, start + duration))
+        if count is not None and len(occurrences) == count:
+            break
+        if len(occurrences) > MAX_SERIES_OCCURRENCES:
+            raise ValueError(f"A series cannot exceed {MAX_SERIES_OCCURRENCES} occurrences")
+
+    if not occurrences:
+        raise ValueError("The recurrence produces no occurrences")
+    if count is not None and len(occurrences) < count:
+        raise ValueError(f"A series cannot exceed {MAX_SERIES_OCCURRENCES} occurrences")
+    return occurrences
+
+
+def create_series(
+    db: Session, series: schemas.SeriesCreate, occurrences: list[tuple[datetime, datetime]]
+) -> tuple[models.AppointmentSeries, list[BatchDecision], list[dict]]:
+    """
+    Check every occurrence against stored bookings (one range query via
+    resolve_batch) and insert the series plus its free occurrences, which
+    are returned as rows. Raises SeriesConflict when nothing is free, or
+    when anything clashes and the request does not allow a partial series.
+    The caller commits.
+    """
+    resources = series.dict(include={"clinic_id", "room_id", "patient_id", "provider_id"})
+    items = [
+        schemas.AppointmentCreate(**resources, start_time=start, end_time=end)
+        for start, end in occurrences
+    ]
+    decisions, rows = resolve_batch(db, items)
+    if not rows or (len(rows) < len(items) and not series.allow_partial):
+        raise SeriesConflict(decisions)
+
+    record = models.AppointmentSeries(
+        series_id=uuid4(),
+        frequency=series.frequency,
+        interval=series.interval,
+        count=series.count,
+        until=series.until,
+        start_time=series.start_time,
+        end_time=series.end_time,
+        **resources,
+    )
+    db.add(record)
+    db.flush()
+
+    for row in rows:
+        row["series_id"] = record.series_id
+    insert_appointments(db, rows)
+    apply_rollup(db, (), rows)
+    return record, decisions, rows
+
+
+def cancel_series(db: Session, series_id: UUID, from_time: datetime) -> list[dict]:
+    """
+    Cancel every active occurrence from from_time on with one UPDATE and
+    return the cancelled rows as they were. They are read first (same index
+    range) and locked on PostgreSQL, and the UPDATE targets exactly those
+    ids, so the rollup delta matches what was written even if a status
+    changes concurrently. Run inside with_write_lock; the caller commits.
+    """
+    Appointment = models.Appointment
+    affected = db.execute(
+        select(Appointment.__table__)
+        .where(
+            Appointment.series_id == series_id,
+            Appointment.start_time >= from_time,
+            Appointment.status.in_(ACTIVE_STATUSES),
+        )
+        .with_for_update()
+    ).mappings().all()
+    if not affected:
+        return []
+
+    db.execute(
+        update(Appointment)
+        .where(Appointment.appt_id.in_([row["appt_id"] for row in affected]))
+        .values(status=models.StatusEnum.cancelled)
+        .execution_options(synchronize_session=False)
+    )
+    apply_rollup(db, affected, [{**row, "status": models.StatusEnum.cancelled} for row in affected])
+    return [dict(row) for row in affected]
+
+
+def shifted(db: Session, column, minutes: int):
+    """
+    SQL for column + minutes. SQLite stores datetimes as text, so the
+    shift goes through strftime and the stored microseconds are kept, which
+    leaves the value in the format (and sort order) SQLAlchemy writes.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return func.strftime("%Y-%m-%d %H:%M:%S", column, f"{minutes:+d} minutes").op("||")(func.substr(column, 20))
+    return column + timedelta(minutes=minutes)
+
+
+def move_series(
+    db: Session, record: models.AppointmentSeries, move: schemas.SeriesMove, from_time: datetime
+) -> tuple[list[BatchDecision], list[tuple[datetime, datetime]], list[tuple[dict, dict]]]:
+    """
+    Shift and/or reassign the active occurrences from from_time on. The new
+    positions are checked in one range query that ignores only the rows
+    being moved; if any clash nothing is changed. Otherwise the rows are
+    rewritten by a single set-based UPDATE. On PostgreSQL the exclusion
+    constraints are deferred to commit for it, since a shift of a period or
+    more passes through sibling occurrences' old slots. Returns the
+    decisions, the new (start, end) pairs and a (before, after) pair of
+    rows per occurrence moved.
+    """
+    Appointment = models.Appointment
+    current = db.execute(
+        select(
+            Appointment.appt_id, Appointment.clinic_id, Appointment.room_id, Appointment.patient_id,
+            Appointment.provider_id, Appointment.status, Appointment.start_time, Appointment.end_time,
+            Appointment.series_id,
+        )
+        .where(
+            Appointment.series_id == record.series_id,
+            Appointment.start_time >= from_time,
+            Appointment.status.in_(ACTIVE_STATUSES),
+        )
+        .order_by(Appointment.start_time)
+    ).all()
+    if not current:
+        return [], [], []
+
+    shift = timedelta(minutes=move.shift_minutes)
+    items = [
+        schemas.AppointmentCreate(
+            clinic_id=row.clinic_id,
+            room_id=move.room_id or row.room_id,
+            patient_id=row.patient_id,
+            provider_id=move.provider_id or row.provider_id,
+            start_time=row.start_time + shift,
+            end_time=row.end_time + shift,
+        )
+        for row in current
+    ]
+    positions = [(item.start_time, item.end_time) for item in items]
+    moved_ids = [row.appt_id for row in current]
+    decisions, _ = resolve_batch(db, items, exclude_appt_ids=moved_ids)
+    if any(decision.status != "created" for decision in decisions):
+        return decisions, positions, []
+
+    values = {}
+    if move.shift_minutes:
+        values["start_time"] = shifted(db, Appointment.start_time, move.shift_minutes)
+        values["end_time"] = shifted(db, Appointment.end_time, move.shift_minutes)
+    if move.room_id:
+        values["room_id"] = move.room_id
+    if move.provider_id:
+        values["provider_id"] = move.provider_id
+    if values:
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text(f"SET CONSTRAINTS {', '.join(EXCLUSION_CONSTRAINTS)} DEFERRED"))
+        db.execute(
+            update(Appointment)
+            .where(Appointment.appt_id.in_(moved_ids))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+    before = [row._asdict() for row in current]
+    after = [{**row, **item.dict()} for row, item in zip(before, items)]
+    apply_rollup(db, before, after)
+
+    if move.room_id:
+        record.room_id = move.room_id
+    if move.provider_id:
+        record.provider_id = move.provider_id
+    if from_time <= record.start_time:
+        record.start_time += shift
+        record.end_time += shift
+        if record.until is not None:
+            record.until += shift
+    return decisions, positions, list(zip(before, after))
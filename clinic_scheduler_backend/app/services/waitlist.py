@@ -0,0 +1,262 @@
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..utils.events import event_hub
+
+logger = logging.getLogger(__name__)
+
+# Minutes a patient has to accept an offered slot; an expired offer puts
+# the entry back in the queue
+WAITLIST_OFFER_MINUTES = int(os.getenv("WAITLIST_OFFER_MINUTES", 30))
+# Widest [earliest, latest] window an entry may ask for. An entry is filed
+# under one heap per day of its window, so this bounds that fan-out.
+WAITLIST_MAX_WINDOW_DAYS = int(os.getenv("WAITLIST_MAX_WINDOW_DAYS", 14))
+# Seconds a clinic's index is trusted before it is reloaded, so entries
+# created or served through other API workers are picked up
+WAITLIST_INDEX_TTL_SECONDS = float(os.getenv("WAITLIST_INDEX_TTL_SECONDS", 60))
+
+# Appointment statuses whose cancellation or deletion frees a slot
+ACTIVE_STATUSES = (models.StatusEnum.booked.value, models.StatusEnum.confirmed.value)
+
+
+class FreedSlot(NamedTuple):
+    clinic_id: UUID
+    room_id: UUID
+    provider_id: UUID
+    start_time: datetime
+    end_time: datetime
+
+
+class WaitlistItem(NamedTuple):
+    entry_id: UUID
+    clinic_id: UUID
+    provider_id: UUID | None
+    patient_id: UUID
+    earliest: datetime
+    latest: datetime
+    duration: timedelta
+    rank: tuple  # (-priority, created_at): smaller is served first
+
+    @classmethod
+    def from_entry(cls, entry: models.WaitlistEntry) -> "WaitlistItem":
+        return cls(
+            entry.entry_id, entry.clinic_id, entry.provider_id, entry.patient_id,
+            entry.earliest, entry.latest, timedelta(minutes=entry.duration_minutes),
+            (-entry.priority, entry.created_at),
+        )
+
+    def placement(self, slot: FreedSlot) -> datetime | None:
+        """Start of this entry's appointment inside the slot, or None if it does not fit."""
+        if self.provider_id is not None and self.provider_id != slot.provider_id:
+            return None
+        start = max(slot.start_time, self.earliest)
+        return start if start + self.duration <= min(slot.end_time, self.latest) else None
+
+
+class WaitlistOffer(NamedTuple):
+    entry_id: UUID
+    patient_id: UUID
+    clinic_id: UUID
+    room_id: UUID
+    provider_id: UUID
+    start_time: datetime
+    end_time: datetime
+    expires_at: datetime
+
+
+def window_days(earliest: datetime, latest: datetime):
+    day = earliest.date()
+    while day <= latest.date():
+        yield day
+        day += timedelta(days=1)
+
+
+class ClinicWaitlist:
+    """
+    One clinic's waiting entries as min-heaps keyed by (provider_id or None,
+    day). An entry sits in the heap of every day its window touches, so a
+    freed slot only looks at the two heaps for its day: its provider's and
+    the any-provider one. Removal is lazy: `live` maps entry_id to the
+    sequence number of its current heap items, and stale items are dropped
+    when they surface.
+    """
+
+    def __init__(self, loaded_at: float):
+        self.loaded_at = loaded_at
+        self.heaps: dict[tuple[UUID | None, date], list] = defaultdict(list)
+        self.live: dict[UUID, tuple[int, WaitlistItem]] = {}
+
+    def push(self, item: WaitlistItem, seq: int):
+        self.live[item.entry_id] = (seq, item)
+        for day in window_days(item.earliest, item.latest):
+            heapq.heappush(self.heaps[(item.provider_id, day)], (item.rank, seq, item.entry_id))
+
+    def best_match(self, slot: FreedSlot, exclude=()) -> WaitlistItem | None:
+        """
+        Highest ranked live entry that fits the slot, removed from the index.
+        Each heap is popped until its top fits; entries that do not fit this
+        slot (wrong time of day, too long) are pushed back afterwards, so
+        the cost is O(log n) per entry examined rather than a scan.
+        """
+        day = slot.start_time.date()
+        best, best_heap, set_aside = None, None, []
+        for key in ((slot.provider_id, day), (None, day)):
+            heap = self.heaps.get(key)
+            while heap:
+                rank, seq, entry_id = heap[0]
+                current = self.live.get(entry_id)
+                if current is None or current[0] != seq:
+                    heapq.heappop(heap)
+                    continue
+                item = current[1]
+                if entry_id not in exclude and item.placement(slot) is not None:
+                    if best is None or (rank, seq) < (best.rank, self.live[best.entry_id][0]):
+                        best, best_heap = item, heap
+                    break
+                set_aside.append((heap, heapq.heappop(heap)))
+
+        if best is not None:
+            heapq.heappop(best_heap)
+            self.live.pop(best.entry_id)
+        for heap, entry in set_aside:
+            heapq.heappush(heap, entry)
+        return best
+
+
+class WaitlistIndex:
+    """
+    In-memory priority index of waiting entries, per clinic. The database
+    stays the source of truth: a clinic is (re)loaded with one indexed
+    query when first used or when older than the TTL, and every offer is
+    claimed with a conditional UPDATE, so a stale index can only cost a
+    wasted candidate, never a double offer.
+    """
+
+    def __init__(self, ttl_seconds: float = WAITLIST_INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._clinics: dict[UUID, ClinicWaitlist] = {}
+        self._seq = itertools.count()
+
+    def clinic(self, db: Session, clinic_id: UUID, now: datetime) -> ClinicWaitlist:
+        clinic = self._clinics.get(clinic_id)
+        if clinic is None or time.monotonic() - clinic.loaded_at > self.ttl_seconds:
+            clinic = ClinicWaitlist(time.monotonic())
+            Entry = models.WaitlistEntry
+            entries = db.execute(
+                select(Entry).where(Entry.clinic_id == clinic_id, Entry.latest > now, claimable(now))
+            ).scalars()
+            for entry in entries:
+                clinic.push(WaitlistItem.from_entry(entry), next(self._seq))
+            self._clinics[clinic_id] = clinic
+        return clinic
+
+    def add(self, item: WaitlistItem):
+        """File a new or re-queued entry; a clinic not loaded yet picks it up on load."""
+        clinic = self._clinics.get(item.clinic_id)
+        if clinic is not None:
+            clinic.push(item, next(self._seq))
+
+    def discard(self, clinic_id: UUID, entry_id: UUID):
+        clinic = self._clinics.get(clinic_id)
+        if clinic is not None:
+            clinic.live.pop(entry_id, None)
+
+    def clear(self):
+        self._clinics.clear()
+
+    def stats(self) -> dict:
+        return {
+            "clinics": len(self._clinics),
+            "entries": sum(len(clinic.live) for clinic in self._clinics.values()),
+        }
+
+
+waitlist_index = WaitlistIndex()
+
+
+def claimable(now: datetime):
+    """Entries that may receive an offer: waiting, or holding an expired one."""
+    Entry = models.WaitlistEntry
+    return or_(
+        Entry.status == "waiting",
+        and_(Entry.status == "offered", Entry.offer_expires_at <= now),
+    )
+
+
+def offer_freed_slot(db: Session, slot: FreedSlot, exclude=(), now: datetime | None = None) -> WaitlistOffer | None:
+    """
+    Offer the slot to the best-matching claimable entry. Candidates come
+    from the index best-first; each is claimed by UPDATE ... WHERE still
+    claimable, and one already served elsewhere is skipped. The caller
+    commits.
+    """
+    now = now or datetime.utcnow()
+    if slot.start_time <= now:
+        return None
+
+    Entry = models.WaitlistEntry
+    clinic = waitlist_index.clinic(db, slot.clinic_id, now)
+    while (item := clinic.best_match(slot, exclude)) is not None:
+        start = item.placement(slot)
+        offer = WaitlistOffer(
+            item.entry_id, item.patient_id, slot.clinic_id, slot.room_id, slot.provider_id,
+            start, start + item.duration, now + timedelta(minutes=WAITLIST_OFFER_MINUTES),
+        )
+        claimed = db.execute(
+            update(Entry)
+            .where(Entry.entry_id == item.entry_id, claimable(now))
+            .values(
+                status="offered",
+                offered_room_id=offer.room_id,
+                offered_provider_id=offer.provider_id,
+                offered_start=offer.start_time,
+                offered_end=offer.end_time,
+                offer_expires_at=offer.expires_at,
+            )
+        ).rowcount
+        if claimed:
+            return offer
+    return None
+
+
+def publish_offer(offer: WaitlistOffer):
+    """Tell the patient (and anyone watching the clinic) about a new offer."""
+    event_hub.publish("waitlist.offered", offer._asdict(), (
+        ("patient", str(offer.patient_id)),
+        ("clinic", str(offer.clinic_id)),
+    ))
+
+
+async def offer_released_slot(db: AsyncSession, appointment: dict) -> WaitlistOffer | None:
+    """
+    Offer a just-cancelled or deleted appointment's slot to the waitlist.
+    Call after the cancellation is committed; a failure here is logged and
+    never undoes it.
+    """
+    slot = FreedSlot(
+        appointment["clinic_id"], appointment["room_id"], appointment["provider_id"],
+        appointment["start_time"], appointment["end_time"],
+    )
+    try:
+        offer = await db.run_sync(offer_freed_slot, slot)
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        logger.exception("Could not offer the freed slot %s to the waitlist", slot)
+        return None
+    if offer is not None:
+        publish_offer(offer)
+    return offer
@@ -0,0 +1,11 @@
+from datetime import datetime, timezone
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """
+    Appointment times are stored as naive timestamps. Convert timezone-aware
+    input to UTC and drop the offset so it compares cleanly with stored rows.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
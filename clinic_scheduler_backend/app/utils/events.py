@@ -0,0 +1,102 @@
+import asyncio
+import itertools
+import os
+from collections import defaultdict
+
+from .fastjson import dumps
+
+# Frames buffered per subscriber before it is considered lagging
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", 100))
+
+# Sent to a subscriber whose queue overflowed: events were dropped, so the
+# client should refetch instead of applying deltas
+RESYNC_EVENT = "resync"
+
+
+class Subscription:
+    def __init__(self, topic: tuple[str, str], maxsize: int):
+        self.topic = topic
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+
+class EventHub:
+    """
+    In-process fan-out of server-sent events. Subscribers listen on one
+    topic such as ("clinic", "<uuid>"). Each event is encoded once, however
+    many tabs are listening, and each subscriber has its own bounded queue,
+    so one slow client never holds up the others or grows memory: when its
+    queue is full the backlog is replaced by a single resync event.
+
+    Only events published in this process are seen; with several API worker
+    processes each client receives the changes made through its own worker
+    plus a resync after reconnecting.
+    """
+
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: dict[tuple[str, str], set[Subscription]] = defaultdict(set)
+        self._ids = itertools.count(1)
+
+    def subscribe(self, topic: tuple[str, str]) -> Subscription:
+        subscription = Subscription(topic, self.queue_size)
+        self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        listeners = self._subscribers.get(subscription.topic)
+        if listeners is not None:
+            listeners.discard(subscription)
+            if not listeners:
+                del self._subscribers[subscription.topic]
+
+    def frame(self, event: str, data) -> bytes:
+        """One SSE message: id, event name and a JSON data line."""
+        return b"id: %d\nevent: %s\ndata: %s\n\n" % (next(self._ids), event.encode(), dumps(data))
+
+    def publish(self, event: str, data, topics):
+        """Queue the event for every subscriber of any of the given topics."""
+        targets = set()
+        for topic in topics:
+            targets.update(self._subscribers.get(topic, ()))
+        if not targets:
+            return
+
+        frame = self.frame(event, data)
+        for subscription in targets:
+            try:
+                subscription.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                subscription.dropped += 1
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(self.frame(RESYNC_EVENT, {"dropped": subscription.dropped}))
+
+    def stats(self) -> dict:
+        return {
+            "topics": len(self._subscribers),
+            "subscribers": sum(len(listeners) for listeners in self._subscribers.values()),
+        }
+
+
+event_hub = EventHub()
+
+
+def appointment_topics(appointment: dict) -> tuple:
+    return (
+        ("clinic", str(appointment["clinic_id"])),
+        ("provider", str(appointment["provider_id"])),
+        ("patient", str(appointment["patient_id"])),
+    )
+
+
+def publish_appointment(event: str, appointment: dict, previous: dict | None = None):
+    """
+    Push an appointment change to everyone watching its clinic, provider or
+    patient, and also those of `previous` when it was reassigned. Call after
+    the change is committed.
+    """
+    topics = appointment_topics(appointment)
+    if previous is not None:
+        topics = appointment_topics(previous) + topics
+    event_hub.publish(event, appointment, topics)
@@ -0,0 +1,47 @@
+import enum
+import gzip
+import json
+import os
+import uuid
+from datetime import date, datetime
+
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is the fallback
+    orjson = None
+
+# Responses at least this large are gzipped when the client accepts it
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", 16 * 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 5))
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode()
+
+
+def json_response(request: Request, content, headers: dict | None = None) -> Response:
+    """
+    Encode plain Python data straight to JSON bytes (no response_model
+    validation) and gzip it when it is large and the client accepts gzip.
+    """
+    body = dumps(content)
+    headers = dict(headers or {})
+    if len(body) >= GZIP_MIN_BYTES and "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,7 +1,16 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
+# bcrypt work factor for new hashes. Stored hashes with a different cost
+# are upgraded transparently the next time their owner logs in.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
 # Configure Passlib context to use bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 
 def truncate_utf8(password: str, max_bytes: int = 72) -> str:
@@ -35,3 +44,71 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     safe_password = truncate_utf8(plain_password)
     return pwd_context.verify(safe_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify a password and, when the stored hash uses an outdated cost,
+    return a replacement hash as the second element.
+    """
+    safe_password = truncate_utf8(plain_password)
+    return pwd_context.verify_and_update(safe_password, hashed_password)
+
+
+class HashingPoolFull(Exception):
+    """Raised when the hashing queue is at capacity."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+class HashingPool:
+    """
+    Dedicated, bounded thread pool for bcrypt. bcrypt releases the GIL, so
+    threads hash in parallel without touching the threadpool that serves
+    sync routes. Work beyond the workers plus queue limit is refused at
+    once instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, queue_limit: int, retry_after: int):
+        self.workers = workers
+        self.capacity = workers + queue_limit
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise HashingPoolFull(self.retry_after)
+            self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+
+_hash_workers = int(os.getenv("HASH_WORKERS", os.cpu_count() or 2))
+hashing_pool = HashingPool(
+    workers=_hash_workers,
+    queue_limit=int(os.getenv("HASH_QUEUE_LIMIT", _hash_workers * 4)),
+    retry_after=int(os.getenv("HASH_RETRY_AFTER_SECONDS", 1)),
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the dedicated pool. Raises HashingPoolFull when saturated."""
+    return await hashing_pool.run(hash_password, password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """verify_and_update_password on the dedicated pool. Raises HashingPoolFull when saturated."""
+    return await hashing_pool.run(verify_and_update_password, plain_password, hashed_password)
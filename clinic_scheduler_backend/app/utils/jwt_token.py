@@ -1,13 +1,16 @@
+import hashlib
 import os
+import time
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models.user import User
+from .cache import TTLCache
 
 SECRET_KEY = os.getenv("SECRET_KEY", "fallback_dev_key")
 ALGORITHM = "HS256"
@@ -15,6 +18,22 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 security = HTTPBearer()
 
+# Authenticated users by id, so protected routes skip the users SELECT.
+# Entries are detached from their session; handlers that modify the user
+# must load their own copy and invalidate the entry.
+user_cache = TTLCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", 1024)),
+    ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", 60)),
+)
+
+# Verified JWT payloads keyed by SHA-256 of the token. Each entry expires
+# with its token's own exp claim, so the signature is checked once per
+# token instead of once per request.
+token_cache = TTLCache(
+    maxsize=int(os.getenv("TOKEN_CACHE_SIZE", 10000)),
+    ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -25,16 +44,37 @@ def create_access_token(data: dict):
 
 
 def verify_token(token: str):
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
 
+    # Keep the verified payload until the token itself expires
+    exp = payload.get("exp")
+    if exp is not None:
+        remaining = exp - time.time()
+        if remaining > 0:
+            token_cache.set(key, payload, ttl=remaining)
+    return payload
+
 
-def get_current_user(
+async def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Verified JWT claims for routes that only need the user id and role."""
+    token = credentials.credentials
+    payload = verify_token(token)
+    if not payload:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return payload
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     token = credentials.credentials
     payload = verify_token(token)
@@ -62,8 +102,12 @@ def get_current_user(
             detail="Invalid user ID format"
         )
 
+    user = user_cache.get(user_uuid)
+    if user is not None:
+        return user
+
     # Query user with proper UUID type
-    user = db.query(User).filter(User.id == user_uuid).first()
+    user = await db.get(User, user_uuid)
 
     if not user:
         raise HTTPException(
@@ -71,4 +115,6 @@ def get_current_user(
             detail="User not found"
         )
 
+    db.expunge(user)
+    user_cache.set(user_uuid, user)
     return user
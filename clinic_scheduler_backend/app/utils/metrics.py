@@ -0,0 +1,222 @@
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Queries slower than this are logged with their SQL
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))
+
+# Add a Server-Timing header (app and db time) to every response
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() in ("1", "true", "yes", "on")
+
+# Histogram upper bounds in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus exposition shape."""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: str) -> list[str]:
+        sep = "," if labels else ""
+        out, running = [], 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            running += count
+            out.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {running}')
+        out.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        out.append(f"{name}_count{{{labels}}} {self.count}")
+        return out
+
+
+@dataclass
+class RequestStats:
+    """Database work done while serving one request."""
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+# Set by MetricsMiddleware for the duration of each request; the engine
+# hooks add to whichever request is current
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class MetricsRegistry:
+    """In-process request and SQL metrics, rendered for Prometheus."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.db_time: dict[tuple[str, str], Histogram] = {}
+        self.query_count: dict[tuple[str, str], Histogram] = {}
+        self.responses: dict[tuple[str, str, int], int] = {}
+        self.queries_total = 0
+        self.query_seconds_total = 0.0
+        self.slow_queries_total = 0
+        # Extra gauges/counters rendered with the request metrics, as
+        # name -> (help, type, callable returning {labels: value})
+        self.collectors: dict[str, tuple[str, str, callable]] = {}
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+        with self._lock:
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.db_time[key] = Histogram(LATENCY_BUCKETS)
+                self.query_count[key] = Histogram(QUERY_COUNT_BUCKETS)
+            self.latency[key].observe(seconds)
+            self.db_time[key].observe(stats.db_seconds)
+            self.query_count[key].observe(stats.queries)
+            status_key = (method, route, status)
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+    def observe_query(self, seconds: float, statement: str):
+        with self._lock:
+            self.queries_total += 1
+            self.query_seconds_total += seconds
+            if seconds * 1000 >= SLOW_QUERY_MS:
+                self.slow_queries_total += 1
+                slow = True
+            else:
+                slow = False
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += seconds
+        if slow:
+            logger.warning("Slow query (%.1f ms): %s", seconds * 1000, " ".join(statement.split())[:1000])
+
+    def register(self, name: str, help_text: str, metric_type: str, collect):
+        self.collectors[name] = (help_text, metric_type, collect)
+
+    def render(self) -> str:
+        out: list[str] = []
+        with self._lock:
+            for name, help_text, series in (
+                ("http_request_duration_seconds", "Request latency by route", self.latency),
+                ("http_request_db_seconds", "Database time per request by route", self.db_time),
+                ("http_request_db_queries", "SQL statements per request by route", self.query_count),
+            ):
+                out += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), histogram in sorted(series.items()):
+                    out += histogram.lines(name, f'method="{method}",route="{route}"')
+
+            out += ["# HELP http_responses_total Responses by route and status", "# TYPE http_responses_total counter"]
+            for (method, route, status), count in sorted(self.responses.items()):
+                out.append(f'http_responses_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+
+            out += [
+                "# HELP db_queries_total SQL statements executed",
+                "# TYPE db_queries_total counter",
+                f"db_queries_total {self.queries_total}",
+                "# HELP db_query_seconds_total Time spent executing SQL",
+                "# TYPE db_query_seconds_total counter",
+                f"db_query_seconds_total {self.query_seconds_total:.6f}",
+                f"# HELP db_slow_queries_total SQL statements slower than {SLOW_QUERY_MS:g} ms",
+                "# TYPE db_slow_queries_total counter",
+                f"db_slow_queries_total {self.slow_queries_total}",
+            ]
+
+        for name, (help_text, metric_type, collect) in self.collectors.items():
+            out += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+            for labels, value in collect().items():
+                out.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+
+        return "\n".join(out) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+# ==========================================================
+# SQLALCHEMY HOOKS
+# ==========================================================
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    metrics.observe_query(time.perf_counter() - started, statement)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    stack = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if stack:
+        stack.pop()
+
+
+def instrument_engine(sync_engine):
+    """Count and time every statement run on the engine (pass .sync_engine for async engines)."""
+    from sqlalchemy import event
+
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+# ==========================================================
+# ASGI MIDDLEWARE
+# ==========================================================
+class MetricsMiddleware:
+    """
+    Times each HTTP request and records it under its route template
+    (e.g. /appointments/{appt_id}), so ids never become label values.
+    Requests that match no route are grouped as "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SERVER_TIMING:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    header = (
+                        f'app;dur={elapsed_ms:.1f}, '
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                    )
+                    message.setdefault("headers", [])
+                    message["headers"] = [*message["headers"], (b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status_code,
+                time.perf_counter() - started,
+                stats,
+            )
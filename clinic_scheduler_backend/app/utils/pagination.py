@@ -0,0 +1,22 @@
+import base64
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(start_time: datetime, appt_id: UUID) -> str:
+    """Opaque keyset cursor for the last row of a page."""
+    raw = f"{start_time.isoformat()}|{appt_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Inverse of encode_cursor. Raises ValueError for anything that was not
+    produced by it.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        start_raw, appt_raw = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(start_raw), UUID(appt_raw)
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
@@ -0,0 +1,232 @@
+import importlib
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import NamedTuple
+
+from starlette.responses import JSONResponse
+
+from .jwt_token import verify_token
+
+# Master switch for the per-route limits below
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+# "memory", or "package.module:ClassName" for a shared RateLimitBackend
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+# Buckets kept by the in-memory backend; the least recently used go first
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+# Take the client address from X-Forwarded-For. Only enable behind a proxy
+# that sets it, otherwise clients can pick their own key.
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() in ("1", "true", "yes", "on")
+# Retry-After sent when a route is at its concurrency cap
+RATE_LIMIT_BUSY_RETRY_AFTER = int(os.getenv("RATE_LIMIT_BUSY_RETRY_AFTER", 1))
+
+
+class Limit(NamedTuple):
+    rate: float  # tokens refilled per second
+    burst: int  # bucket size
+
+
+def parse_limit(spec: str) -> Limit | None:
+    """
+    "N/S" allows N requests per S seconds, in bursts of up to N.
+    An empty value or "off" disables the limit.
+    """
+    if not spec or spec.lower() == "off":
+        return None
+    requests, _, seconds = spec.partition("/")
+    return Limit(int(requests) / float(seconds or 1), int(requests))
+
+
+class RouteRule(NamedTuple):
+    name: str
+    per_ip: Limit | None
+    per_user: Limit | None
+    concurrency: int  # requests in flight per process; 0 for no cap
+
+
+def route_rule(name: str, per_ip: str, per_user: str, concurrency: int) -> RouteRule:
+    prefix = f"RATE_LIMIT_{name.upper()}"
+    return RouteRule(
+        name,
+        parse_limit(os.getenv(f"{prefix}_PER_IP", per_ip)),
+        parse_limit(os.getenv(f"{prefix}_PER_USER", per_user)),
+        int(os.getenv(f"{prefix}_CONCURRENCY", concurrency)),
+    )
+
+
+# Keyed by (method, path without trailing slash). Login and register are
+# anonymous, so only the client address applies; bookings are limited per
+# user as well, so one busy front desk does not starve the rest of its site.
+# A bulk booking (up to MAX_BULK_ITEMS slots) and a series (up to
+# MAX_SERIES_OCCURRENCES) run the same conflict check and insert for every
+# slot, so each gets its own, tighter buckets rather than sharing the
+# single-booking ones.
+RATE_LIMIT_RULES = {
+    ("POST", "/auth/login"): route_rule("login", "20/60", "", 32),
+    ("POST", "/auth/register"): route_rule("register", "10/600", "", 16),
+    ("POST", "/appointments"): route_rule("booking", "300/60", "60/60", 64),
+    ("POST", "/appointments/bulk"): route_rule("booking_bulk", "30/60", "6/60", 8),
+    ("POST", "/series"): route_rule("series", "30/60", "6/60", 8),
+}
+
+# Process-wide counters, exported on /metrics
+rate_limit_stats = {}
+
+
+class RateLimitBackend(ABC):
+    """
+    Where token buckets and in-flight counts live. Methods are async so a
+    backend shared across workers (e.g. Redis) can do network I/O.
+    """
+
+    @abstractmethod
+    async def consume(self, buckets: list[tuple[str, Limit]]) -> float:
+        """
+        Take one token from every (key, limit) bucket, or from none of them
+        when any is empty. 0 when admitted, else seconds until all have one.
+        """
+
+    @abstractmethod
+    async def acquire(self, key: str, capacity: int) -> bool:
+        """Claim an in-flight slot; False when all `capacity` slots are taken."""
+
+    @abstractmethod
+    async def release(self, key: str):
+        """Give back a slot taken by acquire."""
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryBackend(RateLimitBackend):
+    """
+    Buckets in this process's memory, so with several workers each one
+    enforces the limits on its own. Nothing here awaits, so every update
+    runs to completion on the event loop without a lock. Evicting a bucket
+    only refills it early.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._in_flight: dict[str, int] = {}
+
+    async def consume(self, buckets: list[tuple[str, Limit]]) -> float:
+        now = time.monotonic()
+        levels = {}
+        for key, limit in buckets:
+            tokens, updated = self._buckets.pop(key, (limit.burst, now))
+            levels[key] = min(limit.burst, tokens + (now - updated) * limit.rate)
+
+        wait = max((max(0.0, 1 - levels[key]) / limit.rate for key, limit in buckets), default=0.0)
+        for key, tokens in levels.items():
+            self._buckets[key] = (tokens if wait else tokens - 1, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    async def acquire(self, key: str, capacity: int) -> bool:
+        in_flight = self._in_flight.get(key, 0)
+        if in_flight >= capacity:
+            return False
+        self._in_flight[key] = in_flight + 1
+        return True
+
+    async def release(self, key: str):
+        self._in_flight[key] -= 1
+
+    def stats(self) -> dict:
+        return {"buckets": len(self._buckets), "in_flight": dict(self._in_flight)}
+
+
+def load_backend(spec: str) -> RateLimitBackend:
+    """Build a backend from RATE_LIMIT_BACKEND: "memory" or "package.module:ClassName"."""
+    if spec == "memory":
+        return MemoryBackend()
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+rate_limit_backend = load_backend(RATE_LIMIT_BACKEND)
+
+
+def client_address(scope) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def token_user(scope) -> str | None:
+    """user_id of a valid bearer token; invalid tokens are left for the route to refuse."""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            payload = verify_token(token) if scheme.lower() == "bearer" else None
+            return payload.get("user_id") if payload else None
+    return None
+
+
+class RateLimitMiddleware:
+    """
+    Admission control in front of the routes in RATE_LIMIT_RULES: a token
+    bucket per client address and per user, then a cap on requests in
+    flight. Refused requests get 429 with Retry-After before any body is
+    read, any session is opened or bcrypt runs.
+    """
+
+    def __init__(self, app, backend: RateLimitBackend | None = None, rules: dict | None = None):
+        self.app = app
+        self.backend = backend or rate_limit_backend
+        self.rules = RATE_LIMIT_RULES if rules is None else rules
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rule = self.rules.get((scope["method"], scope["path"].rstrip("/")))
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Both buckets are charged together, so a request refused by one
+        # does not use up the other
+        buckets = []
+        if rule.per_ip is not None:
+            buckets.append((f"{rule.name}:ip:{client_address(scope)}", rule.per_ip))
+        if rule.per_user is not None:
+            user_id = token_user(scope)
+            if user_id is not None:
+                buckets.append((f"{rule.name}:user:{user_id}", rule.per_user))
+        wait = await self.backend.consume(buckets) if buckets else 0.0
+        if wait:
+            await self.reject(rule, "rate", math.ceil(wait), scope, receive, send)
+            return
+
+        if not rule.concurrency:
+            await self.app(scope, receive, send)
+            return
+
+        key = f"{rule.name}:in_flight"
+        if not await self.backend.acquire(key, rule.concurrency):
+            await self.reject(rule, "concurrency", RATE_LIMIT_BUSY_RETRY_AFTER, scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await self.backend.release(key)
+
+    async def reject(self, rule: RouteRule, reason: str, retry_after: int, scope, receive, send):
+        label = f'route="{rule.name}",reason="{reason}"'
+        rate_limit_stats[label] = rate_limit_stats.get(label, 0) + 1
+        response = JSONResponse(
+            {"detail": "Too many requests, please retry later"},
+            status_code=429,
+            headers={"Retry-After": str(retry_after)},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+
+class ReferenceCache:
+    """
+    Serialized responses for slow-changing reference data (clinics, rooms,
+    providers). Each namespace carries a version; a POST bumps it, which
+    retires every cached body in that namespace at once. Bodies also expire
+    after ttl seconds so other worker processes, which never see the bump,
+    pick up changes within a bounded time.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._versions: dict[str, int] = defaultdict(int)
+        self._entries: dict[tuple[str, str], tuple[int, float, bytes, str]] = {}
+        self._adapters: dict[Any, TypeAdapter] = {}
+        self._lock = threading.Lock()
+
+    def version(self, namespace: str) -> int:
+        return self._versions[namespace]
+
+    def invalidate(self, namespace: str):
+        with self._lock:
+            self._versions[namespace] += 1
+            for key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[key]
+
+    def _lookup(self, namespace: str, key: str) -> tuple[bytes, str] | None:
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return None
+        version, expires_at, body, etag = entry
+        if version != self._versions[namespace] or expires_at <= time.monotonic():
+            return None
+        return body, etag
+
+    def _store(self, namespace: str, key: str, version: int, body: bytes) -> str:
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        with self._lock:
+            # Skip the store if a POST landed while we were reading
+            if version == self._versions[namespace]:
+                self._entries[(namespace, key)] = (version, time.monotonic() + self.ttl, body, etag)
+        return etag
+
+    def _serialize(self, schema, value) -> bytes:
+        adapter = self._adapters.get(schema)
+        if adapter is None:
+            adapter = self._adapters[schema] = TypeAdapter(schema)
+        return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+    async def respond(
+        self,
+        request: Request,
+        namespace: str,
+        key: str,
+        schema,
+        load: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        """
+        Serve namespace/key from the cache, calling load() and serializing
+        with schema on a miss. Answers 304 when If-None-Match matches.
+        """
+        cached = self._lookup(namespace, key)
+        if cached is None:
+            version = self.version(namespace)
+            body = self._serialize(schema, await load())
+            etag = self._store(namespace, key, version, body)
+        else:
+            body, etag = cached
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+reference_cache = ReferenceCache(ttl=float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", 300)))
@@ -0,0 +1,37 @@
+"""
+Move closed appointments (completed, cancelled, no-show) that ended more
+than ARCHIVE_AFTER_DAYS ago out of the hot appointments table into
+appointments_archive. Run it periodically (e.g. nightly from cron):
+
+    python archive_appointments.py
+    python archive_appointments.py --days 90 --export /var/backups/appointments
+
+The API keeps serving archived rows from appointments_archive whenever a
+request's date range reaches back that far. --export also writes each
+moved row to gzip-compressed NDJSON files, one per month, as a cold copy
+that can be shipped off the database host.
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from app.database import SessionLocal
+from app.services.archive import (
+    ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, NdjsonArchiveWriter, archive_closed
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="Archive appointments that ended this many days ago")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--export", metavar="DIR", help="Also write moved rows to DIR as .ndjson.gz")
+    args = parser.parse_args()
+
+    cutoff = datetime.utcnow() - timedelta(days=args.days)
+    writer = NdjsonArchiveWriter(args.export) if args.export else None
+    moved = archive_closed(SessionLocal, cutoff, writer, args.batch_size)
+    print(f"Archived {moved} appointments that ended before {cutoff:%Y-%m-%d %H:%M}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Standalone benchmark scripts; run from clinic_scheduler_backend/
@@ -0,0 +1,108 @@
+"""
+Occupancy analytics over a quarter in 15-minute buckets: the vectorized
+NumPy engine (app.services.analytics) against a plain Python loop that
+walks every appointment through the buckets it touches.
+
+    python -m benchmarks.bench_analytics [appointments ...]
+
+Appointments are generated straight into columnar arrays (no database), so
+this measures only the aggregation. The Python loop is timed on at most
+PYTHON_MAX_ROWS appointments and scaled linearly to the full count.
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import numpy as np  # noqa: E402
+
+from app.database import engine  # noqa: E402,F401  (imports app.models first)
+from app.services.analytics import (  # noqa: E402
+    STATUS_CODES, AppointmentColumns, occupancy_report, wait_time_report,
+)
+from app import models  # noqa: E402
+
+WINDOW_START = datetime(2030, 1, 1)
+DAYS = 91
+BUCKET_MINUTES = 15
+ROOMS = 400
+CLINICS = 40
+PYTHON_MAX_ROWS = 200_000
+
+
+def synthetic_columns(rows: int, seed: int = 42) -> AppointmentColumns:
+    rng = np.random.default_rng(seed)
+    day = rng.integers(0, DAYS, rows)
+    start_minute = rng.integers(8 * 60, 17 * 60, rows) // 15 * 15
+    origin = np.datetime64(WINDOW_START, "m")
+    start = origin + (day * 1440 + start_minute) * np.timedelta64(1, "m")
+    end = start + rng.choice([15, 30, 45, 60], rows, p=[0.25, 0.5, 0.17, 0.08]) * np.timedelta64(1, "m")
+    created = start - rng.integers(60, 60 * 24 * 30, rows) * np.timedelta64(1, "m")
+    room = rng.integers(0, ROOMS, rows).astype(np.int32)
+    status = rng.choice(
+        [STATUS_CODES[models.StatusEnum.completed], STATUS_CODES[models.StatusEnum.cancelled]], rows, p=[0.92, 0.08]
+    ).astype(np.int8)
+    return AppointmentColumns(
+        clinic=room // (ROOMS // CLINICS),
+        room=room,
+        provider=room,
+        status=status,
+        start=start,
+        end=end,
+        created=created,
+        clinic_ids=list(range(CLINICS)),
+        room_ids=list(range(ROOMS)),
+        provider_ids=list(range(ROOMS)),
+    )
+
+
+def python_occupancy(columns: AppointmentColumns, rows: int) -> list[list[int]]:
+    """The loop the analytics module replaces: datetimes bucket by bucket."""
+    cancelled = STATUS_CODES[models.StatusEnum.cancelled]
+    buckets = DAYS * 1440 // BUCKET_MINUTES
+    heatmap = [[0] * buckets for _ in columns.room_ids]
+    starts = columns.start[:rows].astype(datetime)
+    ends = columns.end[:rows].astype(datetime)
+    for index in range(rows):
+        if columns.status[index] == cancelled:
+            continue
+        start, end = starts[index], ends[index]
+        offset = int((start - WINDOW_START).total_seconds() // 60)
+        length = int((end - start).total_seconds() // 60)
+        room = heatmap[columns.room[index]]
+        while length > 0:
+            bucket, into = divmod(offset, BUCKET_MINUTES)
+            used = min(length, BUCKET_MINUTES - into)
+            room[bucket] += used
+            offset += used
+            length -= used
+    return heatmap
+
+
+def timed(fn, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main(sizes: list[int]):
+    buckets = DAYS * 1440 // BUCKET_MINUTES
+    print(f"{ROOMS} rooms x {buckets} buckets of {BUCKET_MINUTES} min")
+    print(f"{'rows':>10} {'numpy ms':>10} {'waits ms':>10} {'python ms':>11} {'speedup':>8}")
+    for rows in sizes:
+        columns = synthetic_columns(rows)
+        numpy_ms, report = timed(occupancy_report, columns, WINDOW_START, BUCKET_MINUTES, buckets, "room", 8, 17)
+        waits_ms, _ = timed(wait_time_report, columns)
+
+        sample = min(rows, PYTHON_MAX_ROWS)
+        python_ms, heatmap = timed(python_occupancy, columns, sample)
+        python_ms *= rows / sample
+        if sample == rows:
+            assert [resource["minutes"] for resource in report["resources"]] == heatmap
+        print(f"{rows:>10} {numpy_ms:>10.1f} {waits_ms:>10.1f} {python_ms:>11.1f} {python_ms / numpy_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000, 3_000_000])
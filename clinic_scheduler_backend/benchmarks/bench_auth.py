@@ -0,0 +1,42 @@
+"""
+Per-request JWT verification cost with and without the verified-token cache.
+
+    python -m benchmarks.bench_auth [iterations]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from jose import jwt  # noqa: E402
+
+from app.utils.jwt_token import (  # noqa: E402
+    ALGORITHM, SECRET_KEY, create_access_token, token_cache, verify_token,
+)
+
+
+def time_per_call(fn, token: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(token)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(iterations: int = 20000):
+    token = create_access_token({"user_id": "00000000-0000-0000-0000-000000000000", "role": "patient"})
+
+    uncached = time_per_call(lambda t: jwt.decode(t, SECRET_KEY, algorithms=[ALGORITHM]), token, iterations)
+
+    token_cache.clear()
+    verify_token(token)  # first request for this token pays the decode
+    cached = time_per_call(verify_token, token, iterations)
+
+    print(f"iterations:          {iterations}")
+    print(f"jwt.decode per call: {uncached:8.2f} us")
+    print(f"cached verify_token: {cached:8.2f} us")
+    print(f"speedup:             {uncached / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,88 @@
+"""
+Appointment list serialization: the response_model path (ORM objects,
+Pydantic from_attributes, stdlib JSON) against the fast path (column
+tuples, fast JSON encoder, optional gzip).
+
+    python -m benchmarks.bench_serialization [rows ...]
+"""
+import gzip
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.database import Base  # noqa: E402  (imports app.models)
+from app import models, schemas  # noqa: E402
+from app.routers.appointments import LIST_COLUMNS  # noqa: E402
+from app.utils.fastjson import GZIP_LEVEL, dumps  # noqa: E402
+
+
+def build_database(rows: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    clinic, room, patient, provider = (uuid.uuid4() for _ in range(4))
+    start = datetime(2030, 1, 1, 8)
+    with Session(engine) as db:
+        db.execute(insert(models.Appointment), [
+            {
+                "appt_id": uuid.uuid4(), "clinic_id": clinic, "room_id": room,
+                "patient_id": patient, "provider_id": provider,
+                "start_time": start + timedelta(minutes=30 * i),
+                "end_time": start + timedelta(minutes=30 * i + 30),
+                "status": models.StatusEnum.booked,
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+    return engine
+
+
+def orm_path(engine) -> bytes:
+    adapter = TypeAdapter(list[schemas.Appointment])
+    with Session(engine) as db:
+        appointments = db.execute(select(models.Appointment)).scalars().all()
+        validated = adapter.validate_python(appointments, from_attributes=True)
+        return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def fast_path(engine) -> bytes:
+    columns = [getattr(models.Appointment, column) for column in LIST_COLUMNS]
+    with Session(engine) as db:
+        rows = db.execute(select(*columns)).all()
+        return dumps([dict(zip(LIST_COLUMNS, row)) for row in rows])
+
+
+def best_of(fn, *args, repeat: int = 3) -> tuple[float, bytes]:
+    best, result = float("inf"), b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main(sizes: list[int]):
+    print(f"{'rows':>8} {'orm ms':>10} {'fast ms':>10} {'speedup':>8} {'json KB':>9} {'gzip KB':>9} {'gzip ms':>9}")
+    for rows in sizes:
+        engine = build_database(rows)
+        orm_ms, _ = best_of(orm_path, engine)
+        fast_ms, body = best_of(fast_path, engine)
+        gzip_ms, compressed = best_of(gzip.compress, body, GZIP_LEVEL)
+        print(
+            f"{rows:>8} {orm_ms:>10.1f} {fast_ms:>10.1f} {orm_ms / fast_ms:>7.1f}x "
+            f"{len(body) / 1024:>9.0f} {len(compressed) / 1024:>9.0f} {gzip_ms:>9.1f}"
+        )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,187 @@
+"""
+Load-test harness: generates a synthetic dataset, drives the FastAPI app
+in-process (httpx over ASGI, no network or server) and reports latency
+percentiles and throughput per scenario.
+
+    python -m benchmarks.loadtest --requests 500 --concurrency 20 --output results.json
+
+Scenarios: login, book (POST /appointments/), availability (one clinic-day
+search) and list (one page of GET /appointments/ for a clinic). Each runs
+--requests requests with --concurrency in flight. Results are printed and,
+with --output, written as JSON together with the scale and settings, so
+runs can be diffed.
+
+Login latency is dominated by bcrypt; with --concurrency above the hashing
+pool's HASH_QUEUE_LIMIT, the excess is shed as 503 and shows up in the
+status counts. Uses a throwaway SQLite file unless DATABASE_URL is set.
+The rate limiter is off unless RATE_LIMIT_ENABLED is set.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/loadtest.db"
+# Measure the app, not the rate limiter; set RATE_LIMIT_ENABLED=true to include it
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+
+from benchmarks.synthetic import ALEMBIC_INI, SYNTHETIC_PASSWORD, Scale, generate  # noqa: E402
+from app.main import app  # noqa: E402
+
+SCENARIOS = ("login", "book", "availability", "list")
+
+
+def summarize(latencies: list[float], statuses: dict[int, int], elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    cuts = statistics.quantiles(ordered, n=100, method="inclusive") if len(ordered) > 1 else ordered * 99
+    return {
+        "requests": len(ordered),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "throughput_rps": round(len(ordered) / elapsed, 1) if elapsed else None,
+        "mean_ms": round(statistics.fmean(ordered), 2),
+        "p50_ms": round(cuts[49], 2),
+        "p95_ms": round(cuts[94], 2),
+        "p99_ms": round(cuts[98], 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, make_request, requests: int, concurrency: int) -> dict:
+    """Issue `requests` calls of make_request(client, i) with bounded concurrency."""
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    queue = iter(range(requests))
+
+    async def worker():
+        for i in queue:
+            started = time.perf_counter()
+            response = await make_request(client, i)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+async def login(client: httpx.AsyncClient, email: str) -> dict:
+    response = await client.post("/auth/login", json={"email": email, "password": SYNTHETIC_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def drive(data, args) -> dict:
+    rng = random.Random(args.seed)
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        admin = await login(client, data.admin_email)
+        staff = await login(client, data.staff_emails[0])
+
+        async def do_login(client, i):
+            email = data.patient_emails[i % len(data.patient_emails)]
+            return await client.post("/auth/login", json={"email": email, "password": SYNTHETIC_PASSWORD})
+
+        # Bookings land past the generated window, on random resources and
+        # quarter hours, so a realistic share of them conflict
+        book_from = datetime.combine(data.last_day + timedelta(days=1), datetime.min.time())
+
+        async def do_book(client, i):
+            clinic_id = rng.choice(data.clinic_ids)
+            start = book_from + timedelta(days=rng.randrange(5), hours=rng.randrange(8, 17), minutes=15 * rng.randrange(4))
+            return await client.post("/appointments/", headers=staff, json={
+                "clinic_id": str(clinic_id),
+                "room_id": str(rng.choice(data.rooms[clinic_id])),
+                "provider_id": str(rng.choice(data.providers[clinic_id])),
+                "patient_id": str(rng.choice(data.patient_ids)),
+                "start_time": start.isoformat(),
+                "end_time": (start + timedelta(minutes=30)).isoformat(),
+            })
+
+        today = date.today()
+
+        async def do_availability(client, i):
+            day = today + timedelta(days=rng.randrange(1, 15))
+            return await client.get("/availability/", params={
+                "clinic_id": str(rng.choice(data.clinic_ids)),
+                "from": f"{day}T08:00:00",
+                "to": f"{day}T17:00:00",
+            })
+
+        async def do_list(client, i):
+            return await client.get("/appointments/", headers=admin, params={
+                "clinic_id": str(rng.choice(data.clinic_ids)), "limit": args.page_size,
+            })
+
+        scenarios = {"login": do_login, "book": do_book, "availability": do_availability, "list": do_list}
+        for name in args.scenarios:
+            results[name] = await run_scenario(client, scenarios[name], args.requests, args.concurrency)
+            print(format_row(name, results[name]), flush=True)
+
+    return results
+
+
+def format_row(name: str, result: dict) -> str:
+    return (
+        f"{name:<13} {result['requests']:>6} {result['throughput_rps'] or 0:>9.1f} "
+        f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f}  {result['statuses']}"
+    )
+
+
+def parse_args(argv=None):
+    defaults = Scale()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--clinics", type=int, default=defaults.clinics)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scale = Scale(clinics=args.clinics, users=args.users, days=args.days, seed=args.seed)
+
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
+    data = generate(scale)
+    print(f"dataset: {len(data.clinic_ids)} clinics, {scale.users} users, {data.appointments} appointments")
+    print(f"{'scenario':<13} {'reqs':>6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses")
+
+    results = asyncio.run(drive(data, args))
+
+    if args.output:
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": os.environ["DATABASE_URL"].split("://", 1)[0],
+            "scale": {**asdict(scale), "appointments": data.appointments},
+            "settings": {"requests": args.requests, "concurrency": args.concurrency, "page_size": args.page_size},
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,130 @@
+"""
+Concurrency stress test for POST /appointments/: many parallel requests
+race for the same room slots and exactly one must win each slot.
+
+    python -m benchmarks.stress_booking [slots] [contenders]
+
+Uses a throwaway SQLite file unless DATABASE_URL is set (point it at an
+empty PostgreSQL database to exercise the exclusion constraints). The
+rate limiter is off unless RATE_LIMIT_ENABLED is set. Exits non-zero if
+any slot ends up with more or fewer than one booking.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/stress_booking.db"
+# Measure the app, not the rate limiter; set RATE_LIMIT_ENABLED=true to include it
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+
+from app.database import SessionLocal  # noqa: E402
+from app import models  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils.jwt_token import create_access_token  # noqa: E402
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+FIRST_SLOT = datetime(2031, 1, 6, 9, 0)
+SLOT_LENGTH = timedelta(minutes=30)
+
+
+def seed(contenders: int) -> tuple[uuid.UUID, uuid.UUID, list, list]:
+    """One clinic and room; a distinct provider and patient per contender."""
+    with SessionLocal() as db:
+        clinic = models.Clinic(name="Stress Clinic", address="1 Test Street")
+        db.add(clinic)
+        db.flush()
+        room = models.Room(clinic_id=clinic.id, name="Room 1")
+        providers = [
+            models.Provider(clinic_id=clinic.id, name=f"Provider {i}", email=f"stress-provider-{i}@example.com")
+            for i in range(contenders)
+        ]
+        patients = [
+            models.User(name=f"Patient {i}", email=f"stress-patient-{i}@example.com", hashed_password="x")
+            for i in range(contenders)
+        ]
+        db.add_all([room, *providers, *patients])
+        db.commit()
+        return clinic.id, room.id, [p.id for p in providers], [p.id for p in patients]
+
+
+async def fire(slots: int, contenders: int, ids) -> list[tuple[int, int]]:
+    clinic_id, room_id, provider_ids, patient_ids = ids
+    token = create_access_token({"user_id": str(uuid.uuid4()), "role": "staff"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def book(client, slot: int, contender: int):
+        start = FIRST_SLOT + slot * SLOT_LENGTH
+        response = await client.post("/appointments/", headers=headers, json={
+            "clinic_id": str(clinic_id),
+            "room_id": str(room_id),
+            "provider_id": str(provider_ids[contender]),
+            "patient_id": str(patient_ids[contender]),
+            "start_time": start.isoformat(),
+            "end_time": (start + SLOT_LENGTH).isoformat(),
+        })
+        return slot, response.status_code
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://stress") as client:
+        return await asyncio.gather(*(
+            book(client, slot, contender)
+            for contender in range(contenders)
+            for slot in range(slots)
+        ))
+
+
+def stored_bookings(room_id) -> dict[datetime, int]:
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(models.Appointment.start_time, func.count())
+            .where(models.Appointment.room_id == room_id)
+            .group_by(models.Appointment.start_time)
+        ).all()
+    return {start: count for start, count in rows}
+
+
+def main(slots: int = 20, contenders: int = 10):
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
+    ids = seed(contenders)
+
+    started = time.perf_counter()
+    results = asyncio.run(fire(slots, contenders, ids))
+    elapsed = time.perf_counter() - started
+
+    wins = {slot: 0 for slot in range(slots)}
+    statuses: dict[int, int] = {}
+    for slot, status in results:
+        statuses[status] = statuses.get(status, 0) + 1
+        if status == 200:
+            wins[slot] += 1
+    stored = stored_bookings(ids[1])
+
+    failures = [slot for slot, count in wins.items() if count != 1]
+    failures += [
+        slot for slot in range(slots)
+        if stored.get(FIRST_SLOT + slot * SLOT_LENGTH, 0) != 1 and slot not in failures
+    ]
+
+    print(f"database:   {os.environ['DATABASE_URL']}")
+    print(f"requests:   {len(results)} ({slots} slots x {contenders} contenders) in {elapsed:.2f}s")
+    print(f"statuses:   {dict(sorted(statuses.items()))}")
+    print(f"stored:     {sum(stored.values())} bookings for {slots} slots")
+    if failures:
+        print(f"FAILED:     slots without exactly one booking: {sorted(failures)}")
+        sys.exit(1)
+    print("OK:         exactly one booking won each slot")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
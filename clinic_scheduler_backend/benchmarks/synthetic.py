@@ -0,0 +1,222 @@
+"""
+Synthetic data generator: bulk-loads clinics, rooms, providers, users and
+appointments into DATABASE_URL at a configurable scale.
+
+    python -m benchmarks.synthetic --clinics 20 --users 5000 --days 90
+
+Appointments follow a clinic's working week: weekdays only, 08:00-17:00,
+denser in the morning, with 15-60 minute visits and short gaps. Each room
+is paired with one provider per day, so generated bookings never overlap
+on a room or provider. Past visits are completed / no-show / cancelled,
+future ones booked / confirmed / cancelled. The same --seed always
+produces the same data, dated relative to today.
+
+Every generated user has the password SYNTHETIC_PASSWORD. The first user
+is an admin and the next STAFF_RATIO of them are staff.
+"""
+import argparse
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as clock, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from app.database import engine  # noqa: F401  (imports app.models first)
+from app import models
+from app.utils.hashing import hash_password
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+SYNTHETIC_PASSWORD = "synthetic-pass"
+STAFF_RATIO = 0.02
+
+# Rows per multi-row INSERT
+INSERT_CHUNK_SIZE = 5000
+
+DAY_START = clock(8, 0)
+DAY_END = clock(17, 0)
+# Visit length in minutes and its relative frequency
+DURATIONS = ((15, 3), (30, 6), (45, 2), (60, 1))
+# Idle minutes before the next visit, by hour of day (busier mornings)
+GAP_CHOICES = {
+    8: (0, 0, 0, 15), 9: (0, 0, 0, 15), 10: (0, 0, 15, 15), 11: (0, 0, 15, 30),
+    12: (15, 30, 45, 60), 13: (0, 15, 30, 45), 14: (0, 15, 15, 30),
+    15: (0, 15, 30, 45), 16: (15, 30, 45, 60),
+}
+PAST_STATUSES = ((models.StatusEnum.completed, 85), (models.StatusEnum.no_show, 7), (models.StatusEnum.cancelled, 8))
+FUTURE_STATUSES = ((models.StatusEnum.booked, 60), (models.StatusEnum.confirmed, 32), (models.StatusEnum.cancelled, 8))
+
+CITIES = ("Johannesburg", "Pretoria", "Durban", "Cape Town", "Bloemfontein", "Polokwane", "Gqeberha", "Mbombela")
+SPECIALTIES = ("General Practice", "Paediatrics", "Dentistry", "Physiotherapy", "Dermatology", "Optometry")
+ROOM_TYPES = ("exam", "consultation", "procedure")
+
+
+@dataclass
+class Scale:
+    clinics: int = 10
+    rooms_per_clinic: int = 4
+    providers_per_clinic: int = 4
+    users: int = 2000
+    days: int = 60
+    # Days of history before today; the rest of the window is in the future
+    past_days: int = 30
+    seed: int = 42
+
+
+@dataclass
+class Dataset:
+    """Ids of the generated rows, for driving requests against them."""
+    clinic_ids: list = field(default_factory=list)
+    rooms: dict = field(default_factory=dict)  # clinic_id -> [room_id]
+    providers: dict = field(default_factory=dict)  # clinic_id -> [provider_id]
+    admin_email: str = ""
+    staff_emails: list = field(default_factory=list)
+    patient_ids: list = field(default_factory=list)
+    patient_emails: list = field(default_factory=list)
+    appointments: int = 0
+    first_day: date | None = None
+    last_day: date | None = None
+
+
+def weighted(rng: random.Random, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def day_schedule(rng: random.Random, day: date):
+    """Back-to-back visits for one room/provider pair over a working day."""
+    cursor = datetime.combine(day, DAY_START)
+    close = datetime.combine(day, DAY_END)
+    while cursor < close:
+        cursor += timedelta(minutes=rng.choice(GAP_CHOICES[cursor.hour]))
+        end = cursor + timedelta(minutes=weighted(rng, DURATIONS))
+        if end > close:
+            return
+        yield cursor, end
+        cursor = end
+
+
+def insert_chunked(conn, table, rows: list[dict]):
+    for offset in range(0, len(rows), INSERT_CHUNK_SIZE):
+        conn.execute(insert(table), rows[offset:offset + INSERT_CHUNK_SIZE])
+
+
+def generate(scale: Scale, bind=engine) -> Dataset:
+    """Insert a synthetic dataset in one transaction and return its ids."""
+    rng = random.Random(scale.seed)
+    data = Dataset()
+
+    clinics, rooms, providers = [], [], []
+    for c in range(scale.clinics):
+        clinic_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        clinics.append({
+            "id": clinic_id,
+            "name": f"Synthetic Clinic {c + 1}",
+            "address": rng.choice(CITIES),
+            "phone": f"0{rng.randint(10, 89)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        })
+        data.clinic_ids.append(clinic_id)
+        data.rooms[clinic_id] = []
+        data.providers[clinic_id] = []
+        for r in range(scale.rooms_per_clinic):
+            room_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            rooms.append({"id": room_id, "clinic_id": clinic_id, "name": f"Room {r + 1}", "room_type": rng.choice(ROOM_TYPES)})
+            data.rooms[clinic_id].append(room_id)
+        for p in range(scale.providers_per_clinic):
+            provider_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            providers.append({
+                "id": provider_id, "clinic_id": clinic_id, "name": f"Dr Synthetic {c + 1}-{p + 1}",
+                "specialty": rng.choice(SPECIALTIES), "email": f"provider-{c + 1}-{p + 1}@synthetic.example.com",
+            })
+            data.providers[clinic_id].append(provider_id)
+
+    # One bcrypt hash shared by every user keeps generation fast
+    hashed = hash_password(SYNTHETIC_PASSWORD)
+    staff_count = max(1, int(scale.users * STAFF_RATIO))
+    users = []
+    for u in range(scale.users):
+        role = "admin" if u == 0 else "staff" if u <= staff_count else "patient"
+        user_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        email = f"{role}-{u}@synthetic.example.com"
+        users.append({"id": user_id, "name": f"Synthetic User {u}", "email": email, "hashed_password": hashed, "role": role})
+        if role == "admin":
+            data.admin_email = email
+        elif role == "staff":
+            data.staff_emails.append(email)
+        else:
+            data.patient_ids.append(user_id)
+            data.patient_emails.append(email)
+
+    today = date.today()
+    data.first_day = today - timedelta(days=scale.past_days)
+    data.last_day = data.first_day + timedelta(days=scale.days - 1)
+    now = datetime.combine(today, clock(0, 0))
+
+    appointments = []
+    for offset in range(scale.days):
+        day = data.first_day + timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        for clinic_id in data.clinic_ids:
+            day_providers = data.providers[clinic_id][:]
+            rng.shuffle(day_providers)
+            for room_id, provider_id in zip(data.rooms[clinic_id], day_providers):
+                for start, end in day_schedule(rng, day):
+                    appointments.append({
+                        "appt_id": uuid.UUID(int=rng.getrandbits(128), version=4),
+                        "clinic_id": clinic_id,
+                        "room_id": room_id,
+                        "provider_id": provider_id,
+                        "patient_id": rng.choice(data.patient_ids),
+                        "start_time": start,
+                        "end_time": end,
+                        "status": weighted(rng, PAST_STATUSES if start < now else FUTURE_STATUSES),
+                    })
+    data.appointments = len(appointments)
+
+    with bind.begin() as conn:
+        insert_chunked(conn, models.Clinic.__table__, clinics)
+        insert_chunked(conn, models.Room.__table__, rooms)
+        insert_chunked(conn, models.Provider.__table__, providers)
+        insert_chunked(conn, models.User.__table__, users)
+        insert_chunked(conn, models.Appointment.__table__, appointments)
+
+    return data
+
+
+def parse_scale(argv=None) -> Scale:
+    defaults = Scale()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clinics", type=int, default=defaults.clinics)
+    parser.add_argument("--rooms-per-clinic", type=int, default=defaults.rooms_per_clinic)
+    parser.add_argument("--providers-per-clinic", type=int, default=defaults.providers_per_clinic)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument("--past-days", type=int, default=defaults.past_days)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    return Scale(**vars(parser.parse_args(argv)))
+
+
+def main(argv=None):
+    from alembic import command
+    from alembic.config import Config
+
+    scale = parse_scale(argv)
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
+
+    started = time.perf_counter()
+    data = generate(scale)
+    elapsed = time.perf_counter() - started
+
+    print(f"database:     {engine.url!r}")
+    print(f"clinics:      {len(data.clinic_ids)}")
+    print(f"users:        {scale.users} (admin {data.admin_email}, password {SYNTHETIC_PASSWORD!r})")
+    print(f"appointments: {data.appointments} from {data.first_day} to {data.last_day}")
+    print(f"loaded in     {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,77 @@
-import sqlite3
+"""
+Bring the configured database (DATABASE_URL) up to the current schema.
 
-def migrate_db():
-    # Connect directly to SQLite
-    conn = sqlite3.connect('clinic.db')
-    cursor = conn.cursor()
+Fresh databases simply run `alembic upgrade head`. Databases created before
+migrations existed (by the old import-time create_all plus the ad-hoc column
+patches that used to live here) are patched to the baseline revision, stamped,
+and then upgraded.
+
+Run once per deploy, before starting the API workers:
+
+    python migrate_db.py
+"""
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+
+from app.database import engine
+
+BASELINE_REVISION = "0001"
+
+# Columns that older builds added with ALTER TABLE after the fact
+LEGACY_USER_COLUMNS = {
+    "phone": "VARCHAR(20)",
+    "date_of_birth": "DATE",
+    "address": "VARCHAR(255)",
+    "emergency_contact": "VARCHAR(100)",
+    "created_at": "TIMESTAMP",
+    "updated_at": "TIMESTAMP",
+}
 
-    # Check if columns exist and add them if not
-    cursor.execute("PRAGMA table_info(users)")
-    columns = [row[1] for row in cursor.fetchall()]
+BASELINE_INDEXES = {
+    "ix_appointments_room_time": "room_id, start_time, end_time",
+    "ix_appointments_provider_time": "provider_id, start_time, end_time",
+    "ix_appointments_patient_time": "patient_id, start_time, end_time",
+    "ix_appointments_clinic_time": "clinic_id, start_time",
+    "ix_appointments_start_appt": "start_time, appt_id",
+    "ix_appointments_status_time": "status, start_time",
+}
 
-    if 'phone' not in columns:
-        cursor.execute("ALTER TABLE users ADD COLUMN phone VARCHAR(20)")
-        print("Added phone column")
 
-    if 'date_of_birth' not in columns:
-        cursor.execute("ALTER TABLE users ADD COLUMN date_of_birth DATE")
-        print("Added date_of_birth column")
+def alembic_config() -> Config:
+    return Config(str(Path(__file__).resolve().parent / "alembic.ini"))
 
-    if 'address' not in columns:
-        cursor.execute("ALTER TABLE users ADD COLUMN address VARCHAR(255)")
-        print("Added address column")
 
-    if 'emergency_contact' not in columns:
-        cursor.execute("ALTER TABLE users ADD COLUMN emergency_contact VARCHAR(100)")
-        print("Added emergency_contact column")
+def patch_legacy_schema():
+    """Make a pre-migration database match the baseline revision."""
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("users")}
 
-    conn.commit()
-    conn.close()
+    with engine.begin() as conn:
+        for name, column_type in LEGACY_USER_COLUMNS.items():
+            if name not in columns:
+                conn.execute(text(f"ALTER TABLE users ADD COLUMN {name} {column_type}"))
+                print(f"Added {name} column")
+
+        for name, columns_sql in BASELINE_INDEXES.items():
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON appointments ({columns_sql})"))
+        print("Ensured appointment indexes")
+
+
+def migrate_db():
+    config = alembic_config()
+    tables = set(inspect(engine).get_table_names())
+
+    if "users" in tables and "alembic_version" not in tables:
+        patch_legacy_schema()
+        command.stamp(config, BASELINE_REVISION)
+        print(f"Stamped legacy database at revision {BASELINE_REVISION}")
+
+    command.upgrade(config, "head")
     print("Migration completed")
 
+
 if __name__ == "__main__":
     migrate_db()
@@ -0,0 +1,30 @@
+"""
+Recompute the daily utilization rollup (utilization_daily) from the
+appointments and appointments_archive tables. The API keeps the rollup current on every write; run
+this after upgrading to revision 0005, after bulk imports that bypass the
+API, or whenever the rollup is suspected to have drifted:
+
+    python rebuild_rollups.py
+    python rebuild_rollups.py --from 2025-01-01 --to 2025-02-01
+"""
+import argparse
+from datetime import date
+
+from app.database import SessionLocal
+from app.services.rollups import rebuild_rollup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="First day (inclusive)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="Last day (exclusive)")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        rows = rebuild_rollup(db, args.date_from, args.date_to)
+        db.commit()
+    print(f"Wrote {rows} rollup rows")
+
+
+if __name__ == "__main__":
+    main()
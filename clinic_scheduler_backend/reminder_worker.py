@@ -0,0 +1,32 @@
+"""
+Run the reminder scheduler and dispatcher as its own process, away from
+the API workers:
+
+    python reminder_worker.py
+
+REMINDER_SENDER picks the delivery backend: "log" (default),
+"file:/path/to/reminders.ndjson", or "package.module:ClassName" for a
+custom app.services.reminders.ReminderSender. Several workers can run
+side by side on PostgreSQL; claims use SKIP LOCKED.
+"""
+import asyncio
+import logging
+import os
+import signal
+
+from app.services.reminders import ReminderDispatcher, load_sender
+
+
+async def main():
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    dispatcher = ReminderDispatcher(load_sender(os.getenv("REMINDER_SENDER", "log")))
+    await dispatcher.run(stop)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main())
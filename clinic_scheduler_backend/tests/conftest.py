@@ -0,0 +1,70 @@
+import os
+import tempfile
+import uuid
+from pathlib import Path
+
+# A throwaway SQLite file, set before the app (and its engines) is imported;
+# the rate limiter would otherwise start refusing the fixtures' requests
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import pytest  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import SessionLocal  # noqa: E402
+from app import models  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils.jwt_token import create_access_token  # noqa: E402
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+@pytest.fixture(scope="session")
+def client():
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def bearer(role: str) -> dict:
+    token = create_access_token({"user_id": str(uuid.uuid4()), "role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def staff():
+    return bearer("staff")
+
+
+@pytest.fixture
+def admin():
+    return bearer("admin")
+
+
+@pytest.fixture
+def clinic(client):
+    """A fresh clinic with two rooms, two providers and two patients, as id strings."""
+    suffix = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        record = models.Clinic(name=f"Clinic {suffix}", address="1 Test Street")
+        db.add(record)
+        db.flush()
+        rooms = [models.Room(clinic_id=record.id, name=f"Room {i}") for i in range(2)]
+        providers = [
+            models.Provider(clinic_id=record.id, name=f"Provider {i}", email=f"provider-{i}-{suffix}@example.com")
+            for i in range(2)
+        ]
+        patients = [
+            models.User(name=f"Patient {i}", email=f"patient-{i}-{suffix}@example.com", hashed_password="x")
+            for i in range(2)
+        ]
+        db.add_all([*rooms, *providers, *patients])
+        db.commit()
+        return {
+            "clinic_id": str(record.id),
+            "room_ids": [str(room.id) for room in rooms],
+            "provider_ids": [str(provider.id) for provider in providers],
+            "patient_ids": [str(patient.id) for patient in patients],
+        }
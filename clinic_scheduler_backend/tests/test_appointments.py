@@ -0,0 +1,65 @@
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.database import SessionLocal
+from app import models
+
+FIRST = datetime(2031, 5, 5, 8, 0)
+APPOINTMENTS = 40
+
+
+@contextmanager
+def count_statements():
+    """Statements sent to any engine while the block runs."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def busy_clinic(client):
+    """A clinic whose appointments each have their own room, provider and patient."""
+    suffix = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        clinic = models.Clinic(name=f"Clinic {suffix}", address="1 Test Street")
+        db.add(clinic)
+        db.flush()
+        for i in range(APPOINTMENTS):
+            room = models.Room(clinic_id=clinic.id, name=f"Room {i}")
+            provider = models.Provider(clinic_id=clinic.id, name=f"Provider {i}", email=f"p-{i}-{suffix}@example.com")
+            patient = models.User(name=f"Patient {i}", email=f"u-{i}-{suffix}@example.com", hashed_password="x")
+            db.add_all([room, provider, patient])
+            db.flush()
+            db.add(models.Appointment(
+                clinic_id=clinic.id, room_id=room.id, provider_id=provider.id, patient_id=patient.id,
+                start_time=FIRST + timedelta(minutes=15 * i), end_time=FIRST + timedelta(minutes=15 * i + 15),
+            ))
+        db.commit()
+        return str(clinic.id)
+
+
+def test_expand_runs_a_fixed_number_of_queries(client, admin, busy_clinic):
+    counts = {}
+    for limit in (5, APPOINTMENTS):
+        with count_statements() as statements:
+            response = client.get("/appointments/", headers=admin, params={
+                "clinic_id": busy_clinic, "limit": limit, "expand": "clinic,room,provider,patient",
+            })
+        assert response.status_code == 200, response.text
+        assert len(response.json()) == limit
+        assert all(row["patient"] and row["provider"] for row in response.json())
+        counts[limit] = len(statements)
+
+    assert counts[5] == counts[APPOINTMENTS]
@@ -0,0 +1,88 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+from app.database import AsyncSessionLocal, SessionLocal, async_engine
+from app import models
+from app.services.booking import BookingConflict, book_appointment
+
+SLOT = datetime(2031, 6, 2, 9, 0)
+CONTENDERS = 12
+
+
+def seed_contenders(clinic_id: uuid.UUID) -> list[tuple[uuid.UUID, uuid.UUID]]:
+    """A (provider, patient) pair per contender, so only the room is contended."""
+    suffix = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        pairs = [
+            (
+                models.Provider(clinic_id=clinic_id, name=f"Provider {i}", email=f"race-p-{i}-{suffix}@example.com"),
+                models.User(name=f"Patient {i}", email=f"race-u-{i}-{suffix}@example.com", hashed_password="x"),
+            )
+            for i in range(CONTENDERS)
+        ]
+        db.add_all([record for pair in pairs for record in pair])
+        db.commit()
+        return [(provider.id, patient.id) for provider, patient in pairs]
+
+
+async def race(clinic_id: uuid.UUID, room_id: uuid.UUID, pairs) -> list:
+    async def attempt(provider_id, patient_id):
+        async with AsyncSessionLocal() as db:
+            try:
+                appointment = await book_appointment(db, {
+                    "appt_id": uuid.uuid4(),
+                    "clinic_id": clinic_id,
+                    "room_id": room_id,
+                    "provider_id": provider_id,
+                    "patient_id": patient_id,
+                    "start_time": SLOT,
+                    "end_time": SLOT + timedelta(minutes=30),
+                })
+                return appointment.appt_id
+            except BookingConflict as e:
+                return e
+
+    try:
+        return await asyncio.gather(*(attempt(*pair) for pair in pairs))
+    finally:
+        # The pool's connections belong to this event loop
+        await async_engine.dispose()
+
+
+def test_concurrent_bookings_for_one_slot_admit_exactly_one(clinic):
+    clinic_id, room_id = uuid.UUID(clinic["clinic_id"]), uuid.UUID(clinic["room_ids"][0])
+
+    outcomes = asyncio.run(race(clinic_id, room_id, seed_contenders(clinic_id)))
+
+    booked = [outcome for outcome in outcomes if isinstance(outcome, uuid.UUID)]
+    assert len(booked) == 1
+    assert all(outcome.resources == ["room"] for outcome in outcomes if isinstance(outcome, BookingConflict))
+    with SessionLocal() as db:
+        assert db.query(models.Appointment).filter_by(room_id=room_id, start_time=SLOT).count() == 1
+
+
+def test_reinstating_a_cancelled_appointment_checks_for_conflicts(client, staff, clinic):
+    slot = SLOT + timedelta(days=1)
+
+    def book(patient_id):
+        response = client.post("/appointments/", headers=staff, json={
+            "clinic_id": clinic["clinic_id"],
+            "room_id": clinic["room_ids"][0],
+            "provider_id": clinic["provider_ids"][0],
+            "patient_id": patient_id,
+            "start_time": slot.isoformat(),
+            "end_time": (slot + timedelta(minutes=30)).isoformat(),
+        })
+        assert response.status_code == 200, response.text
+        return response.json()["appt_id"]
+
+    first = book(clinic["patient_ids"][0])
+    assert client.put(f"/appointments/{first}/status", headers=staff, params={"status": "cancelled"}).status_code == 200
+    book(clinic["patient_ids"][1])
+
+    response = client.put(f"/appointments/{first}/status", headers=staff, params={"status": "booked"})
+
+    assert response.status_code == 409, response.text
+    with SessionLocal() as db:
+        assert db.get(models.Appointment, uuid.UUID(first)).status == models.StatusEnum.cancelled
@@ -0,0 +1,57 @@
+import asyncio
+import uuid
+
+from app.utils.jwt_token import create_access_token
+from app.utils.ratelimit import RATE_LIMIT_RULES, Limit, MemoryBackend, RateLimitMiddleware, RouteRule
+
+
+async def ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def call(middleware, path="/appointments/bulk", headers=()):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": path, "headers": list(headers), "client": ("10.0.0.1", 1234)}
+    await middleware(scope, receive, send)
+    return sent[0]["status"], dict(sent[0]["headers"])
+
+
+def test_bulk_and_series_booking_have_their_own_rules():
+    assert RATE_LIMIT_RULES[("POST", "/appointments/bulk")].name == "booking_bulk"
+    assert RATE_LIMIT_RULES[("POST", "/series")].name == "series"
+
+
+def test_refused_past_burst_with_retry_after():
+    rules = {("POST", "/appointments/bulk"): RouteRule("bulk", Limit(1 / 60, 2), None, 0)}
+    middleware = RateLimitMiddleware(ok, MemoryBackend(), rules)
+
+    responses = [asyncio.run(call(middleware)) for _ in range(3)]
+
+    assert [status for status, _ in responses] == [200, 200, 429]
+    assert int(responses[2][1][b"retry-after"]) >= 1
+    assert asyncio.run(call(middleware, "/appointments/bulk/"))[0] == 429
+    assert asyncio.run(call(middleware, "/clinics/"))[0] == 200
+
+
+def test_refusal_by_the_user_bucket_leaves_the_ip_bucket_alone():
+    rules = {("POST", "/appointments/bulk"): RouteRule("bulk", Limit(1 / 60, 3), Limit(1 / 60, 1), 0)}
+    middleware = RateLimitMiddleware(ok, MemoryBackend(), rules)
+
+    def user():
+        token = create_access_token({"user_id": str(uuid.uuid4()), "role": "staff"})
+        return [(b"authorization", f"Bearer {token}".encode())]
+
+    busy = user()
+    statuses = [asyncio.run(call(middleware, headers=busy))[0] for _ in range(4)]
+    # Only the admitted request came out of the shared IP bucket
+    statuses += [asyncio.run(call(middleware, headers=user()))[0] for _ in range(3)]
+
+    assert statuses == [200, 429, 429, 429, 200, 200, 429]
@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import func, select
+
+from app.database import SessionLocal
+from app import models
+from app.services.reminders import schedule_reminders
+
+START = datetime(2031, 4, 7, 9, 0)
+
+
+def test_delete_appointment_drops_its_reminder_jobs(client, staff, clinic):
+    response = client.post("/appointments/", headers=staff, json={
+        "clinic_id": clinic["clinic_id"],
+        "room_id": clinic["room_ids"][0],
+        "patient_id": clinic["patient_ids"][0],
+        "provider_id": clinic["provider_ids"][0],
+        "start_time": START.isoformat(),
+        "end_time": (START + timedelta(minutes=30)).isoformat(),
+    })
+    assert response.status_code == 200, response.text
+    appt_id = UUID(response.json()["appt_id"])
+
+    with SessionLocal() as db:
+        assert schedule_reminders(db, START - timedelta(hours=24)) >= 1
+        db.commit()
+
+    response = client.delete(f"/appointments/{appt_id}", headers=staff)
+
+    assert response.status_code == 200, response.text
+    with SessionLocal() as db:
+        jobs = db.execute(
+            select(func.count()).select_from(models.ReminderOutbox).where(models.ReminderOutbox.appt_id == appt_id)
+        ).scalar()
+    assert jobs == 0
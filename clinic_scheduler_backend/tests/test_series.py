@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app import models
+from app.utils.events import event_hub
+
+FIRST = datetime(2031, 3, 3, 9, 0)
+WEEK = timedelta(days=7)
+
+
+def book_weekly(client, staff, clinic, count=4) -> str:
+    response = client.post("/series/", headers=staff, json={
+        "clinic_id": clinic["clinic_id"],
+        "room_id": clinic["room_ids"][0],
+        "patient_id": clinic["patient_ids"][0],
+        "provider_id": clinic["provider_ids"][0],
+        "start_time": FIRST.isoformat(),
+        "end_time": (FIRST + timedelta(minutes=30)).isoformat(),
+        "frequency": "weekly",
+        "count": count,
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["created"] == count
+    return response.json()["series"]["series_id"]
+
+
+def occurrence_starts(series_id: str) -> list[datetime]:
+    with SessionLocal() as db:
+        return list(db.execute(
+            select(models.Appointment.start_time)
+            .where(models.Appointment.series_id == UUID(series_id))
+            .order_by(models.Appointment.start_time)
+        ).scalars())
+
+
+def test_move_forward_one_full_period(client, staff, clinic):
+    series_id = book_weekly(client, staff, clinic)
+
+    response = client.post(f"/series/{series_id}/move", headers=staff, json={
+        "shift_minutes": int(WEEK.total_seconds() // 60),
+        "from_time": FIRST.isoformat(),
+    })
+
+    assert response.status_code == 200, response.text
+    assert response.json()["updated"] == 4
+    assert occurrence_starts(series_id) == [FIRST + WEEK * (i + 1) for i in range(4)]
+
+
+def test_move_back_onto_unmoved_occurrence_conflicts(client, staff, clinic):
+    series_id = book_weekly(client, staff, clinic)
+
+    # Moves the last two occurrences a week back: the third lands on the second
+    response = client.post(f"/series/{series_id}/move", headers=staff, json={
+        "shift_minutes": -int(WEEK.total_seconds() // 60),
+        "from_time": (FIRST + WEEK * 2).isoformat(),
+    })
+
+    assert response.status_code == 409, response.text
+    assert occurrence_starts(series_id) == [FIRST + WEEK * i for i in range(4)]
+
+
+def test_cancel_from_an_occurrence_cancels_the_rest(client, staff, clinic):
+    series_id = book_weekly(client, staff, clinic)
+
+    response = client.post(f"/series/{series_id}/cancel", headers=staff, params={"from": (FIRST + WEEK).isoformat()})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["updated"] == 3
+    with SessionLocal() as db:
+        statuses = db.execute(
+            select(models.Appointment.status)
+            .where(models.Appointment.series_id == UUID(series_id))
+            .order_by(models.Appointment.start_time)
+        ).scalars().all()
+    assert statuses == [models.StatusEnum.booked] + [models.StatusEnum.cancelled] * 3
+
+
+def drain(subscription) -> list[str]:
+    events = []
+    while not subscription.queue.empty():
+        frame = subscription.queue.get_nowait()
+        events.append(frame.split(b"\n")[1].removeprefix(b"event: ").decode())
+    return events
+
+
+def test_series_changes_are_published(client, staff, clinic):
+    watchers = {
+        "clinic": event_hub.subscribe(("clinic", clinic["clinic_id"])),
+        "old provider": event_hub.subscribe(("provider", clinic["provider_ids"][0])),
+    }
+    try:
+        series_id = book_weekly(client, staff, clinic, count=3)
+        client.post(f"/series/{series_id}/move", headers=staff, json={
+            "shift_minutes": 30, "provider_id": clinic["provider_ids"][1], "from_time": FIRST.isoformat(),
+        })
+        client.post(f"/series/{series_id}/cancel", headers=staff, params={"from": FIRST.isoformat()})
+        events = {name: drain(subscription) for name, subscription in watchers.items()}
+    finally:
+        for subscription in watchers.values():
+            event_hub.unsubscribe(subscription)
+
+    assert events["clinic"] == ["appointment.created"] * 3 + ["appointment.updated"] * 3 + ["appointment.status"] * 3
+    # Reassigned away: the old provider still hears about the move
+    assert events["old provider"] == ["appointment.created"] * 3 + ["appointment.updated"] * 3
+
+
+def test_cancelled_occurrences_are_offered_to_the_waitlist(client, staff, clinic):
+    series_id = book_weekly(client, staff, clinic)
+    response = client.post("/waitlist/", headers=staff, json={
+        "clinic_id": clinic["clinic_id"],
+        "patient_id": clinic["patient_ids"][1],
+        "earliest": (FIRST + WEEK).isoformat(),
+        "latest": (FIRST + WEEK + timedelta(hours=8)).isoformat(),
+        "duration_minutes": 30,
+    })
+    assert response.status_code == 200, response.text
+    entry_id = response.json()["entry_id"]
+
+    response = client.post(f"/series/{series_id}/cancel", headers=staff, params={"from": (FIRST + WEEK).isoformat()})
+
+    assert response.status_code == 200, response.text
+    with SessionLocal() as db:
+        entry = db.get(models.WaitlistEntry, UUID(entry_id))
+        assert entry.status == "offered"
+        assert entry.offered_start == FIRST + WEEK